@@ -9,7 +9,7 @@ import json
 import asyncio
 from logging import getLogger
 import uuid
-from typing import List, AsyncGenerator
+from typing import List, AsyncGenerator, Optional
 from datetime import datetime
 from fastapi import APIRouter, HTTPException, Path, Query
 from fastapi.responses import StreamingResponse
@@ -18,6 +18,12 @@ from fastapi.responses import StreamingResponse
 CONTINUE_PATTERN = re.compile(r'\[CONTINUE:\s*(.+?)\]', re.IGNORECASE)
 COMPLETE_PATTERN = re.compile(r'\[TASK_COMPLETE\]', re.IGNORECASE)
 
+# Maximum number of queued SSE events flushed together in one chunk
+SSE_MAX_COALESCED_EVENTS = 64
+
+# Maximum number of SSE events buffered per stream before dropping the oldest
+SSE_EVENT_QUEUE_SIZE = 1024
+
 from service.claude_manager.models import (
     CreateSessionRequest,
     SessionInfo,
@@ -231,6 +237,11 @@ async def execute_prompt(
 
 # ========== SSE Streaming Execution API ==========
 
+def _format_sse_frame(event_data: dict) -> str:
+    """Serialize an event dict into an SSE "data:" frame."""
+    return f"data: {json.dumps(event_data, ensure_ascii=False)}\n\n"
+
+
 @router.post("/{session_id}/execute/stream")
 async def execute_prompt_stream(
     session_id: str = Path(..., description="Session ID"),
@@ -259,7 +270,20 @@ async def execute_prompt_stream(
 
     async def event_generator() -> AsyncGenerator[str, None]:
         """Generate SSE events from Claude execution."""
-        event_queue: asyncio.Queue = asyncio.Queue()
+        event_queue: asyncio.Queue = asyncio.Queue(maxsize=SSE_EVENT_QUEUE_SIZE)
+
+        def put_frame(frame: Optional[str]) -> None:
+            """Queue a frame without blocking; drop the oldest one when full.
+
+            A slow or disconnected client lets the queue fill up, so memory
+            stays bounded and the producer (including the final None
+            sentinel) never waits on the reader.
+            """
+            try:
+                event_queue.put_nowait(frame)
+            except asyncio.QueueFull:
+                event_queue.get_nowait()
+                event_queue.put_nowait(frame)
 
         def on_stream_event(event: StreamEvent):
             """Callback for stream events - puts event in queue."""
@@ -288,11 +312,8 @@ async def execute_prompt_stream(
                 event_data["is_error"] = event.is_error
                 event_data["result"] = event.result_text
 
-            # Put in queue (non-blocking)
-            try:
-                event_queue.put_nowait(event_data)
-            except asyncio.QueueFull:
-                pass
+            # Serialize here, on the reader side, so the queue holds ready frames
+            put_frame(_format_sse_frame(event_data))
 
         # Start execution in background task
         async def run_execution():
@@ -312,25 +333,35 @@ async def execute_prompt_stream(
                     "error": str(e),
                     "timestamp": datetime.now().isoformat()
                 }
-                await event_queue.put(error_event)
+                put_frame(_format_sse_frame(error_event))
             finally:
                 # Signal end of stream
-                await event_queue.put(None)
+                put_frame(None)
 
         # Start execution task
         execution_task = asyncio.create_task(run_execution())
 
         try:
-            while True:
-                event_data = await event_queue.get()
-
-                if event_data is None:
-                    # End of stream
-                    break
-
-                # Format as SSE
-                sse_data = json.dumps(event_data, ensure_ascii=False)
-                yield f"data: {sse_data}\n\n"
+            done = False
+            while not done:
+                frame = await event_queue.get()
+                frames: List[str] = []
+
+                # Coalesce frames that are already queued into a single chunk
+                while True:
+                    if frame is None:
+                        # End of stream
+                        done = True
+                        break
+
+                    frames.append(frame)
+
+                    if len(frames) >= SSE_MAX_COALESCED_EVENTS or event_queue.empty():
+                        break
+                    frame = event_queue.get_nowait()
+
+                if frames:
+                    yield "".join(frames)
 
         except asyncio.CancelledError:
             execution_task.cancel()
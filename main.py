@@ -140,6 +140,8 @@ async def lifespan(app: FastAPI):
 
     # Inject Redis client into AgentSessionManager
     agent_manager.set_redis_client(redis_client)
+    if redis_client and redis_client.is_connected:
+        agent_manager.start_session_events()
 
     # Initialize Config Manager
     print_step_banner("CONFIG", "CONFIG MANAGER", "Loading configurations...")
@@ -193,6 +195,11 @@ async def lifespan(app: FastAPI):
     except asyncio.TimeoutError:
         logger.warning("Session cleanup timed out, some processes may still be running")
 
+    # Release pooled Redis connections
+    redis_client = get_app_redis_client(app)
+    if redis_client:
+        redis_client.close()
+
 
 # Create FastAPI app
 app = FastAPI(
@@ -213,7 +220,10 @@ app.add_middleware(
 
 # Session routing middleware (Session-based proxy for multi-pod environment)
 # Note: add_middleware executes in reverse order (last added runs first)
-app.add_middleware(SessionRoutingMiddleware)
+app.add_middleware(
+    SessionRoutingMiddleware,
+    is_local_session=agent_manager.has_local_session,
+)
 
 
 @app.get("/")
@@ -5,6 +5,7 @@ Utilities for finding and configuring Claude CLI (Node.js based).
 """
 import os
 import shutil
+from functools import lru_cache
 from logging import getLogger
 from pathlib import Path
 from typing import Optional, List
@@ -14,6 +15,22 @@ from service.claude_manager.platform_utils import IS_WINDOWS, IS_MACOS, IS_LINUX
 logger = getLogger(__name__)
 
 
+@lru_cache(maxsize=32)
+def _which_cached(name: str, path: str) -> Optional[str]:
+    """shutil.which memoized per (name, PATH) pair."""
+    return shutil.which(name, path=path)
+
+
+def _which(name: str) -> Optional[str]:
+    """
+    Resolve an executable on PATH, caching the result.
+
+    Each session initialization resolves the same binaries; shutil.which
+    stats every PATH entry, so lookups are cached keyed by the PATH value.
+    """
+    return _which_cached(name, os.environ.get('PATH', os.defpath))
+
+
 class ClaudeNodeConfig:
     """
     Configuration for direct Node.js execution of Claude CLI.
@@ -51,7 +68,7 @@ def find_claude_node_config() -> Optional[ClaudeNodeConfig]:
 
         # Check common npm global installation paths
         for ext in ['.cmd', '.ps1', '']:
-            found = shutil.which(f"claude{ext}")
+            found = _which(f"claude{ext}")
             if found:
                 claude_cmd_paths.append(Path(found))
 
@@ -86,7 +103,7 @@ def find_claude_node_config() -> Optional[ClaudeNodeConfig]:
                         node_path = str(potential_node)
                     else:
                         # Use node from PATH
-                        node_path = shutil.which('node') or shutil.which('node.exe')
+                        node_path = _which('node') or _which('node.exe')
 
                     if node_path and cli_js_path:
                         logger.info(f"Found Claude via cmd wrapper: node={node_path}, cli={cli_js_path}")
@@ -104,7 +121,7 @@ def find_claude_node_config() -> Optional[ClaudeNodeConfig]:
             if cli_path.exists():
                 cli_js_path = str(cli_path)
                 base_dir = str(cli_path.parent.parent.parent.parent)  # up to npm root
-                node_path = shutil.which('node') or shutil.which('node.exe')
+                node_path = _which('node') or _which('node.exe')
 
                 if node_path:
                     logger.info(f"Found Claude via direct search: node={node_path}, cli={cli_js_path}")
@@ -112,7 +129,7 @@ def find_claude_node_config() -> Optional[ClaudeNodeConfig]:
 
     else:
         # Unix-like systems: find claude binary and derive cli.js path
-        claude_path = shutil.which('claude')
+        claude_path = _which('claude')
 
         if claude_path:
             # Read the shebang/script to find cli.js
@@ -131,21 +148,23 @@ def find_claude_node_config() -> Optional[ClaudeNodeConfig]:
                 if cli_path.exists():
                     cli_js_path = str(cli_path)
                     base_dir = str(cli_path.parent.parent.parent.parent)
-                    node_path = shutil.which('node')
+                    node_path = _which('node')
 
                     if node_path:
                         logger.info(f"Found Claude on Unix: node={node_path}, cli={cli_js_path}")
                         return ClaudeNodeConfig(node_path, cli_js_path, base_dir)
 
         # Fallback: just use 'claude' command directly (for compatibility)
-        claude_path = shutil.which('claude')
+        claude_path = _which('claude')
         if claude_path:
-            node_path = shutil.which('node')
+            node_path = _which('node')
             if node_path:
                 # Return with claude_path as cli.js - will be handled specially
                 logger.info(f"Falling back to claude binary: {claude_path}")
                 return ClaudeNodeConfig(node_path, str(claude_path), str(Path(claude_path).parent))
 
+    # Drop cached misses so a later install is picked up on the next lookup
+    _which_cached.cache_clear()
     logger.warning("Claude CLI (Node.js configuration) not found")
     return None
 
@@ -161,7 +180,7 @@ def find_claude_executable() -> Optional[str]:
         if IS_WINDOWS:
             return config.node_path  # Return node.exe on Windows
         else:
-            return shutil.which('claude')  # Return claude binary on Unix
+            return _which('claude')  # Return claude binary on Unix
     return None
 
 
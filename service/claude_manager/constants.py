@@ -7,6 +7,12 @@ Constants and configuration values used across the Claude manager modules.
 # Buffer limit: 16MB
 STDIO_BUFFER_LIMIT = 16 * 1024 * 1024
 
+# Chunk size for reading CLI output pipes (lines are split locally)
+STREAM_READ_CHUNK = 64 * 1024
+
+# Number of trailing stderr lines kept per execution (for error reporting)
+STDERR_TAIL_LINES = 200
+
 # Claude execution timeout (default 30 minutes)
 CLAUDE_DEFAULT_TIMEOUT = 1800
 
@@ -183,7 +183,8 @@ async def create_subprocess_cross_platform(
     stderr: Optional[int] = None,
     env: Optional[Dict[str, str]] = None,
     cwd: Optional[str] = None,
-    limit: int = STDIO_BUFFER_LIMIT
+    limit: int = STDIO_BUFFER_LIMIT,
+    new_process_group: bool = False
 ):
     """
     Create a subprocess in a cross-platform compatible way.
@@ -200,6 +201,8 @@ async def create_subprocess_cross_platform(
         env: Environment variables dictionary
         cwd: Working directory path
         limit: Buffer limit for stdio pipes (only used on Unix)
+        new_process_group: Start the child as leader of its own process group
+            so it can be signalled together with its children (only used on Unix)
 
     Returns:
         The created subprocess (WindowsProcessWrapper on Windows, asyncio.subprocess.Process on Unix).
@@ -254,7 +257,8 @@ async def create_subprocess_cross_platform(
                 stderr=stderr,
                 env=env,
                 cwd=cwd,
-                limit=limit
+                limit=limit,
+                process_group=0 if new_process_group else None
             )
             logger.debug(f"Unix subprocess created with PID: {process.pid}")
             return process
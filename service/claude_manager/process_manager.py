@@ -11,18 +11,19 @@ import json
 import os
 import re
 import shutil
+import signal
 import time
+from collections import deque
 from logging import getLogger
 from pathlib import Path
-from typing import Optional, Dict, List, Any, Callable
+from typing import Optional, Dict, List, Any, Callable, Deque
 from datetime import datetime
 
 from service.claude_manager.models import SessionStatus, MCPConfig
-from service.claude_manager.constants import CLAUDE_DEFAULT_TIMEOUT, STDIO_BUFFER_LIMIT
+from service.claude_manager.constants import CLAUDE_DEFAULT_TIMEOUT, STDIO_BUFFER_LIMIT, STDERR_TAIL_LINES, STREAM_READ_CHUNK
 from service.claude_manager.platform_utils import (
     IS_WINDOWS,
     DEFAULT_STORAGE_ROOT,
-    get_claude_env_vars,
     create_subprocess_cross_platform,
 )
 from service.claude_manager.cli_discovery import (
@@ -347,10 +348,9 @@ class ClaudeProcess:
             )
 
             try:
-                # Prepare environment variables
-                env = os.environ.copy()
-                env.update(get_claude_env_vars())
-                env.update(self.env_vars)
+                # Prepare environment variables (CLAUDE_ENV_KEYS are already
+                # part of os.environ, so a single merge is sufficient)
+                env = {**os.environ, **self.env_vars} if self.env_vars else dict(os.environ)
 
                 # Get Claude CLI config
                 node_config = self._node_config or find_claude_node_config()
@@ -410,7 +410,8 @@ class ClaudeProcess:
                     stderr=asyncio.subprocess.PIPE,
                     env=env,
                     cwd=self.working_dir,
-                    limit=STDIO_BUFFER_LIMIT
+                    limit=STDIO_BUFFER_LIMIT,
+                    new_process_group=True
                 )
 
                 # Stream output with real-time parsing
@@ -488,50 +489,40 @@ class ClaudeProcess:
 
         Reads stdout line by line and parses each JSON event.
         """
-        stdout_lines: List[str] = []
-        stderr_lines: List[str] = []
-
-        async def read_stdout():
-            """Read stdout and parse stream-json lines."""
-            while True:
-                try:
-                    line = await process.stdout.readline()
-                    if not line:
-                        break
-                    line_str = line.decode('utf-8', errors='replace').strip()
-                    if line_str:
-                        stdout_lines.append(line_str)
-                        # Parse each JSON line for real-time events
-                        stream_parser.parse_line(line_str)
-                except Exception as e:
-                    logger.warning(f"[{self.session_id}] stdout read error: {e}")
-                    break
-
-        async def read_stderr():
-            """Read stderr for error messages."""
-            while True:
-                try:
-                    line = await process.stderr.readline()
-                    if not line:
-                        break
-                    line_str = line.decode('utf-8', errors='replace').strip()
-                    if line_str:
-                        stderr_lines.append(line_str)
-                        logger.debug(f"[{self.session_id}] stderr: {line_str}")
-                except Exception as e:
-                    logger.warning(f"[{self.session_id}] stderr read error: {e}")
-                    break
+        # Ring buffer: only the tail of stderr is kept, however chatty the CLI is
+        stderr_lines: Deque[str] = deque(maxlen=STDERR_TAIL_LINES)
+
+        def on_stderr_line(line: bytes):
+            """Keep stderr lines for error messages."""
+            line_str = line.strip().decode('utf-8', errors='replace')
+            if line_str:
+                stderr_lines.append(line_str)
+                logger.debug(f"[{self.session_id}] stderr: {line_str}")
+
+        # Readers run as tracked tasks so they never outlive this call
+        reader_tasks = [
+            # stdout: parse raw bytes directly, no intermediate str copy
+            asyncio.create_task(
+                self._read_stream(process.stdout, stream_parser.parse_line, "stdout"),
+                name=f"claude-stdout-{self.session_id}"
+            ),
+            asyncio.create_task(
+                self._read_stream(process.stderr, on_stderr_line, "stderr"),
+                name=f"claude-stderr-{self.session_id}"
+            ),
+        ]
 
         try:
             # Write prompt to stdin and close
-            process.stdin.write(prompt.encode('utf-8'))
-            await process.stdin.drain()
-            process.stdin.close()
-            await process.stdin.wait_closed()
+            stdin = process.stdin
+            stdin.write(prompt.encode('utf-8'))
+            await stdin.drain()
+            stdin.close()
+            await stdin.wait_closed()
 
             # Read stdout and stderr concurrently with timeout
             await asyncio.wait_for(
-                asyncio.gather(read_stdout(), read_stderr()),
+                asyncio.gather(*reader_tasks),
                 timeout=timeout
             )
 
@@ -545,6 +536,16 @@ class ClaudeProcess:
                 "success": False,
                 "error": f"Execution timed out after {timeout} seconds"
             }
+        except asyncio.CancelledError:
+            # Caller went away (e.g. SSE client disconnected); don't leave the CLI running
+            logger.warning(f"[{self.session_id}] Execution cancelled, terminating process")
+            await self._kill_current_process()
+            raise
+        finally:
+            for task in reader_tasks:
+                if not task.done():
+                    task.cancel()
+            await asyncio.gather(*reader_tasks, return_exceptions=True)
 
         success = process.returncode == 0
         error = None
@@ -555,10 +556,73 @@ class ClaudeProcess:
         return {
             "success": success,
             "error": error,
-            "stdout_lines": stdout_lines,
-            "stderr_lines": stderr_lines
+            "stderr_lines": list(stderr_lines)
         }
 
+    async def _read_stream(
+        self,
+        stream,
+        on_line: Callable[[bytes], Any],
+        stream_name: str
+    ) -> None:
+        """
+        Read a process stream until EOF, passing each line to on_line.
+
+        On Unix the pipe is read in large chunks and split on newlines
+        locally, so there is one await per chunk rather than per line. A
+        line longer than STDIO_BUFFER_LIMIT is dropped with a warning
+        instead of growing the buffer without bound. The Windows
+        thread-backed reader blocks in read(n) until n bytes arrive, so it
+        keeps readline.
+        """
+        try:
+            if IS_WINDOWS:
+                while True:
+                    line = await stream.readline()
+                    if not line:
+                        break
+                    on_line(line)
+                return
+
+            buf = bytearray()
+            # Set while discarding the rest of a line over STDIO_BUFFER_LIMIT
+            skipping = False
+            while True:
+                chunk = await stream.read(STREAM_READ_CHUNK)
+                if not chunk:
+                    # EOF: flush a final unterminated line
+                    if buf and not skipping:
+                        on_line(bytes(buf))
+                    break
+
+                # Bytes already in buf hold no newline; only scan the new chunk
+                search = len(buf)
+                buf += chunk
+                start = 0
+                with memoryview(buf) as view:
+                    while True:
+                        end = buf.find(b"\n", search)
+                        if end == -1:
+                            break
+                        if skipping:
+                            skipping = False
+                        else:
+                            on_line(bytes(view[start:end + 1]))
+                        start = search = end + 1
+                if start:
+                    del buf[:start]
+
+                if len(buf) > STDIO_BUFFER_LIMIT:
+                    if not skipping:
+                        logger.warning(
+                            f"[{self.session_id}] {stream_name} line exceeds "
+                            f"{STDIO_BUFFER_LIMIT} bytes, dropping it"
+                        )
+                    skipping = True
+                    buf.clear()
+        except Exception as e:
+            logger.warning(f"[{self.session_id}] {stream_name} read error: {e}")
+
     def _format_tool_detail(self, tool_name: str, tool_input: Dict) -> str:
         """
         Format tool input into a concise, informative detail string.
@@ -674,10 +738,10 @@ class ClaudeProcess:
             prompt_preview = prompt[:200] + "..." if len(prompt) > 200 else prompt
             output_preview = output[:500] + "..." if len(output) > 500 else output
 
-            # Format tool calls
+            # Format tool calls (collected in a list and joined once)
             tool_section = ""
             if tool_calls:
-                tool_section = "\n### Tool Calls\n"
+                tool_lines = ["\n### Tool Calls\n"]
                 for i, tool in enumerate(tool_calls, 1):
                     tool_name = tool.get("name", "unknown")
                     tool_input = tool.get("input", {})
@@ -685,7 +749,8 @@ class ClaudeProcess:
                     input_str = json.dumps(tool_input, ensure_ascii=False)
                     if len(input_str) > 200:
                         input_str = input_str[:200] + "..."
-                    tool_section += f"- **[{i}] {tool_name}**: `{input_str}`\n"
+                    tool_lines.append(f"- **[{i}] {tool_name}**: `{input_str}`\n")
+                tool_section = "".join(tool_lines)
 
             # Format cost
             cost_str = f"**Cost:** ${cost_usd:.6f}\n" if cost_usd else ""
@@ -709,9 +774,10 @@ class ClaudeProcess:
 
 """
 
-            # Create file with header if it doesn't exist
-            if not log_path.exists():
-                header = f"""# Work Log - Session {self.session_id}
+            # Single open + write: prepend the header when the file is new
+            with open(log_path, 'a', encoding='utf-8') as f:
+                if f.tell() == 0:
+                    header = f"""# Work Log - Session {self.session_id}
 
 **Session Name:** {self.session_name or 'Unnamed'}
 **Created:** {self.created_at.strftime("%Y-%m-%d %H:%M:%S")}
@@ -720,10 +786,7 @@ class ClaudeProcess:
 This file contains a log of all work performed by this session.
 
 """
-                log_path.write_text(header, encoding='utf-8')
-
-            # Append log entry
-            with open(log_path, 'a', encoding='utf-8') as f:
+                    log_entry = header + log_entry
                 f.write(log_entry)
 
             logger.debug(f"[{self.session_id}] Work log updated: {log_path}")
@@ -732,33 +795,42 @@ This file contains a log of all work performed by this session.
             logger.warning(f"[{self.session_id}] Failed to write work log: {e}")
 
     async def _kill_current_process(self):
-        """Forcefully terminate the currently running process (cross-platform)."""
-        if self._current_process:
+        """
+        Forcefully terminate the currently running process (cross-platform).
+
+        On Unix the CLI is its own process group leader (pgid == pid), so the
+        whole group is signalled, including tool subprocesses it spawned.
+        """
+        process = self._current_process
+        if process:
             try:
-                if IS_WINDOWS:
-                    # On Windows, use terminate() first, then kill() if needed
-                    # kill() on Windows is equivalent to terminate()
-                    self._current_process.terminate()
-                    try:
-                        await asyncio.wait_for(self._current_process.wait(), timeout=5.0)
-                    except asyncio.TimeoutError:
-                        # Force kill if graceful termination fails
-                        self._current_process.kill()
-                        await self._current_process.wait()
-                else:
-                    # On Unix, try SIGTERM first, then SIGKILL
-                    try:
-                        self._current_process.terminate()
-                        await asyncio.wait_for(self._current_process.wait(), timeout=5.0)
-                    except asyncio.TimeoutError:
-                        self._current_process.kill()
-                        await self._current_process.wait()
+                self._signal_process(process, force=False)
+                try:
+                    await asyncio.wait_for(process.wait(), timeout=5.0)
+                except asyncio.TimeoutError:
+                    # Force kill if graceful termination fails
+                    self._signal_process(process, force=True)
+                    await process.wait()
             except ProcessLookupError:
                 # Process already terminated
                 logger.debug(f"[{self.session_id}] Process already terminated")
             except Exception as e:
                 logger.warning(f"[{self.session_id}] Failed to kill process: {e}")
 
+    @staticmethod
+    def _signal_process(process, force: bool) -> None:
+        """Send SIGTERM/SIGKILL to the process group (Unix) or terminate (Windows)."""
+        if IS_WINDOWS:
+            # terminate() and kill() are equivalent on Windows
+            process.terminate()
+            return
+        sig = signal.SIGKILL if force else signal.SIGTERM
+        try:
+            os.killpg(process.pid, sig)
+        except PermissionError:
+            # Not a group leader we own; fall back to the single process
+            process.send_signal(sig)
+
     def list_storage_files(self, subpath: str = "") -> List[Dict]:
         """
         List all files in the storage directory recursively.
@@ -4,10 +4,13 @@ Claude Session Manager
 Uses Redis as the true source for multi-pod environment support.
 Local processes are managed in memory, session metadata is stored in Redis.
 """
+import asyncio
 import os
+import threading
+import time
 import uuid
 from logging import getLogger
-from typing import Dict, Optional, List
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, List, Set, Tuple
 
 from service.claude_manager.process_manager import ClaudeProcess
 from service.claude_manager.models import (
@@ -18,17 +21,49 @@ from service.claude_manager.models import (
     MCPConfig
 )
 from service.redis.redis_client import RedisClient, get_redis_client
-from service.pod.pod_info import get_pod_info
+from service.pod.pod_info import PodInfo, get_pod_info
 from service.logging.session_logger import get_session_logger, remove_session_logger
 
 logger = getLogger(__name__)
 
+# Maximum number of sessions torn down concurrently during cleanup
+MAX_PARALLEL_SESSION_CLEANUP = 4
+
+# How long (seconds) a SessionInfo read from Redis is served from memory
+SESSION_INFO_CACHE_TTL = 1.0
+
+# Value -> member lookups for stored enum strings (skips Enum.__call__)
+_STATUS_BY_VALUE: Dict[str, SessionStatus] = {s.value: s for s in SessionStatus}
+_ROLE_BY_VALUE: Dict[str, SessionRole] = {r.value: r for r in SessionRole}
+
 
 def is_redis_enabled() -> bool:
     """Check if Redis is enabled via environment variable."""
     return os.getenv('USE_REDIS', 'false').lower() == 'true'
 
 
+async def gather_bounded(
+    func: Callable[[Any], Awaitable[Any]],
+    items: Iterable[Any],
+    limit: int = MAX_PARALLEL_SESSION_CLEANUP
+) -> None:
+    """
+    Run func(item) for every item concurrently, at most `limit` at a time.
+
+    Failures are logged per item and do not abort the remaining calls.
+    """
+    semaphore = asyncio.Semaphore(limit)
+
+    async def _guarded(item: Any) -> None:
+        async with semaphore:
+            try:
+                await func(item)
+            except Exception as e:
+                logger.warning(f"[{item}] Cleanup failed: {e}")
+
+    await asyncio.gather(*(_guarded(item) for item in items))
+
+
 def merge_mcp_configs(base: Optional[MCPConfig], override: Optional[MCPConfig]) -> Optional[MCPConfig]:
     """
     Merge two MCP configurations (override takes priority).
@@ -66,6 +101,19 @@ class SessionManager:
         # Cache whether Redis is enabled at startup
         self._redis_enabled: bool = is_redis_enabled()
 
+        # Pod identity, resolved on first use (after startup has run init_pod_info)
+        self._pod_info: Optional[PodInfo] = None
+
+        # Short-lived cache of Redis reads: session_id -> (expires_at, SessionInfo)
+        self._session_info_cache: Dict[str, Tuple[float, SessionInfo]] = {}
+
+        # Local copy of all Redis sessions, kept current by Pub/Sub events.
+        # Only used while the event listener runs (see start_session_events).
+        self._session_events_live: bool = False
+        self._sessions_snapshot: Optional[Dict[str, dict]] = None
+        self._stale_session_ids: Set[str] = set()
+        self._snapshot_lock = threading.Lock()
+
     def set_redis_client(self, redis_client: RedisClient):
         """Set Redis client (lazy injection)."""
         self._redis = redis_client
@@ -77,6 +125,86 @@ class SessionManager:
         if config and config.servers:
             logger.info(f"✅ Global MCP config registered: {list(config.servers.keys())}")
 
+    def start_session_events(self) -> bool:
+        """
+        Subscribe to Redis session events so list_sessions can serve a
+        local snapshot instead of re-reading every session.
+        """
+        if not self.redis or not self.redis.is_connected:
+            return False
+
+        return self.redis.subscribe_session_events(
+            self._on_session_event,
+            self._on_session_events_stopped,
+            self._on_session_events_started,
+        )
+
+    def _on_session_event(self, session_id: str):
+        """Mark a session as changed (called from the Redis listener thread)."""
+        with self._snapshot_lock:
+            self._stale_session_ids.add(session_id)
+        self._session_info_cache.pop(session_id, None)
+
+    def _on_session_events_started(self):
+        """Start serving snapshots again (also after a Redis reconnect)."""
+        with self._snapshot_lock:
+            self._sessions_snapshot = None
+            self._stale_session_ids = set()
+            self._session_events_live = True
+
+    def _on_session_events_stopped(self):
+        """Fall back to reading Redis directly once events stop arriving."""
+        with self._snapshot_lock:
+            self._session_events_live = False
+            self._sessions_snapshot = None
+        self._session_info_cache.clear()
+
+    def _load_redis_sessions(self) -> List[dict]:
+        """
+        Return all session dicts from Redis.
+
+        With the event listener running, only sessions announced as changed
+        since the last call are re-fetched; otherwise everything is read.
+        """
+        if not self._session_events_live:
+            return self.redis.get_all_sessions()
+
+        # The listener thread may drop the snapshot at any time, so work on
+        # a private copy and publish it back only while events are live
+        with self._snapshot_lock:
+            stale, self._stale_session_ids = self._stale_session_ids, set()
+            snapshot = self._sessions_snapshot
+
+        if snapshot is not None and stale:
+            fresh = self.redis.get_sessions(list(stale))
+            if fresh is None:
+                snapshot = None
+            else:
+                snapshot = dict(snapshot)
+                for session_id, data in fresh.items():
+                    if data is None:
+                        snapshot.pop(session_id, None)
+                    else:
+                        snapshot[session_id] = data
+
+        if snapshot is None:
+            all_sessions = self.redis.get_all_sessions()
+            # An empty result may be a failed read; don't pin it
+            if not all_sessions:
+                return all_sessions
+            snapshot = {
+                data['session_id']: data
+                for data in all_sessions
+                if data.get('session_id')
+            }
+
+        with self._snapshot_lock:
+            if self._session_events_live:
+                self._sessions_snapshot = snapshot
+
+        # Callers overlay local process state, so hand out copies
+        return [dict(data) for data in snapshot.values()]
+
     @property
     def global_mcp_config(self) -> Optional[MCPConfig]:
         """Return global MCP configuration."""
@@ -96,6 +224,13 @@ class SessionManager:
                 logger.warning(f"Could not get Redis client: {e}")
         return self._redis
 
+    @property
+    def pod_info(self) -> PodInfo:
+        """Return this pod's identity (fixed for the process lifetime)."""
+        if self._pod_info is None:
+            self._pod_info = get_pod_info()
+        return self._pod_info
+
     @property
     def sessions(self) -> Dict[str, ClaudeProcess]:
         """Sessions property for compatibility (returns local processes)."""
@@ -161,7 +296,7 @@ class SessionManager:
         self._local_processes[session_id] = process
 
         # Get pod information
-        pod_info = get_pod_info()
+        pod_info = self.pod_info
 
         # Create SessionInfo
         session_info = SessionInfo(
@@ -208,17 +343,36 @@ class SessionManager:
         """
         return self._local_processes.get(session_id)
 
+    def has_local_session(self, session_id: str) -> bool:
+        """
+        Check whether the session runs on this pod (in-memory, no Redis).
+
+        Used by the routing middleware to skip the Redis pod lookup.
+        """
+        return session_id in self._local_processes
+
     def get_session_info(self, session_id: str) -> Optional[SessionInfo]:
         """
         Get session metadata (Redis priority).
 
         Retrieves session info from Redis (supports multi-pod environment).
         """
+        cached = self._session_info_cache.get(session_id)
+        if cached:
+            if cached[0] > time.monotonic():
+                return cached[1]
+            # The Redis listener thread may have dropped it already
+            self._session_info_cache.pop(session_id, None)
+
         # First try Redis
         if self.redis and self.redis.is_connected:
             session_data = self.redis.get_session(session_id)
             if session_data:
-                return self._dict_to_session_info(session_data)
+                session_info = self._dict_to_session_info(session_data)
+                self._session_info_cache[session_id] = (
+                    time.monotonic() + SESSION_INFO_CACHE_TTL, session_info
+                )
+                return session_info
 
         # If not in Redis, generate from local process
         process = self._local_processes.get(session_id)
@@ -238,7 +392,8 @@ class SessionManager:
 
         # Query all sessions from Redis (multi-pod environment)
         if self.redis and self.redis.is_connected:
-            all_sessions = self.redis.get_all_sessions()
+            all_sessions = self._load_redis_sessions()
+            stopped_ids: List[str] = []
 
             for session_data in all_sessions:
                 session_id = session_data.get('session_id')
@@ -250,13 +405,20 @@ class SessionManager:
                     if not local_process.is_alive() and local_process.status == SessionStatus.RUNNING:
                         local_process.status = SessionStatus.STOPPED
                         session_data['status'] = SessionStatus.STOPPED.value
-                        self.redis.update_session_field(session_id, 'status', SessionStatus.STOPPED.value)
+                        stopped_ids.append(session_id)
+                        self._invalidate_session_info(session_id)
                     else:
                         session_data['status'] = local_process.status.value
                         session_data['pid'] = local_process.pid
 
                 sessions_info.append(self._dict_to_session_info(session_data))
 
+            # Persist all status changes in one transaction (status field only)
+            if stopped_ids:
+                self.redis.update_sessions_field(
+                    stopped_ids, 'status', SessionStatus.STOPPED.value
+                )
+
             return sessions_info
 
         # Without Redis, return only local processes
@@ -304,8 +466,10 @@ class SessionManager:
             # Remove from local
             del self._local_processes[session_id]
 
+        self._invalidate_session_info(session_id)
+
         # Also delete from Redis
-        if self.redis and self.redis.is_connected:
+        if self.redis and self.redis.accepts_writes:
             self.redis.delete_session(session_id)
             logger.info(f"[{session_id}] Session deleted from Redis")
             return True
@@ -321,19 +485,26 @@ class SessionManager:
             if not process.is_alive()
         ]
 
-        for session_id in dead_sessions:
+        async def _cleanup(session_id: str):
             logger.info(f"[{session_id}] Cleaning up dead session")
             await self.delete_session(session_id)
 
+        # Sessions are independent; stop them concurrently (bounded)
+        await gather_bounded(_cleanup, dead_sessions)
+
     # ========== Helper Methods ==========
 
+    def _invalidate_session_info(self, session_id: str):
+        """Drop the cached SessionInfo for a session after it changes."""
+        self._session_info_cache.pop(session_id, None)
+
     def _save_session_to_redis(self, session_id: str, session_info: SessionInfo):
         """Save session information to Redis (only if Redis is enabled)."""
         # Skip silently if Redis is disabled
         if not self._redis_enabled:
             return
 
-        if not self.redis or not self.redis.is_connected:
+        if not self.redis or not self.redis.accepts_writes:
             # Only log warning if Redis was supposed to be available but isn't
             logger.warning(f"Redis enabled but not connected - session {session_id} stored locally only")
             return
@@ -358,6 +529,7 @@ class SessionManager:
         }
 
         self.redis.save_session(session_id, session_data)
+        self._invalidate_session_info(session_id)
         logger.debug(f"Session saved to Redis: {session_id}")
 
     def _load_manager_prompt(self) -> Optional[str]:
@@ -380,7 +552,7 @@ class SessionManager:
 
     def _process_to_session_info(self, session_id: str, process: ClaudeProcess) -> SessionInfo:
         """Convert ClaudeProcess to SessionInfo."""
-        pod_info = get_pod_info()
+        pod_info = self.pod_info
         return SessionInfo(
             session_id=session_id,
             session_name=process.session_name,
@@ -396,7 +568,7 @@ class SessionManager:
             storage_path=process.storage_path,
             pod_name=pod_info.pod_name,
             pod_ip=pod_info.pod_ip,
-            role=SessionRole(process.role),
+            role=_ROLE_BY_VALUE.get(process.role) or SessionRole(process.role),
             manager_id=process.manager_id
         )
 
@@ -404,11 +576,11 @@ class SessionManager:
         """Convert dictionary to SessionInfo."""
         status = data.get('status')
         if isinstance(status, str):
-            status = SessionStatus(status)
+            status = _STATUS_BY_VALUE.get(status) or SessionStatus(status)
 
         role = data.get('role', 'worker')
         if isinstance(role, str):
-            role = SessionRole(role)
+            role = _ROLE_BY_VALUE.get(role) or SessionRole(role)
 
         return SessionInfo(
             session_id=data.get('session_id', ''),
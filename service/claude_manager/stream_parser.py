@@ -9,10 +9,22 @@ from logging import getLogger
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
-from typing import Optional, Dict, List, Any, Callable
+from types import MappingProxyType
+from typing import Optional, Dict, List, Any, Callable, Mapping, Union
 
 logger = getLogger(__name__)
 
+# Shared read-only default for missing sub-objects; avoids allocating a
+# throwaway {} on every .get() in the per-line parse path
+_EMPTY: Mapping[str, Any] = MappingProxyType({})
+
+# Use orjson (C extension) for stream decoding when installed
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
 
 class StreamEventType(str, Enum):
     """Types of events from Claude CLI stream-json output."""
@@ -28,9 +40,14 @@ class StreamEventType(str, Enum):
     UNKNOWN = "unknown"                   # Unknown event type
 
 
-@dataclass
+@dataclass(slots=True)
 class StreamEvent:
-    """Parsed event from Claude CLI stream-json output."""
+    """
+    Parsed event from Claude CLI stream-json output.
+
+    Slotted: one instance is created per stream line, so skipping the
+    per-instance __dict__ keeps long executions lighter.
+    """
     event_type: StreamEventType
     timestamp: datetime
     raw_data: Dict[str, Any]
@@ -112,25 +129,27 @@ class StreamParser:
         self.on_event = on_event
         self.session_id = session_id
         self.summary = ExecutionSummary()
-        self._current_tool_use: Optional[Dict[str, Any]] = None
+        # In-flight tool_use blocks keyed by content block index, so
+        # interleaved blocks cannot overwrite each other
+        self._pending_tool_uses: Dict[int, Dict[str, Any]] = {}
 
-    def parse_line(self, line: str) -> Optional[StreamEvent]:
+    def parse_line(self, line: Union[str, bytes]) -> Optional[StreamEvent]:
         """
         Parse a single JSON line from stream output.
 
         Args:
-            line: Raw JSON line from Claude CLI.
+            line: Raw JSON line from Claude CLI (str or undecoded bytes).
 
         Returns:
             Parsed StreamEvent or None if line is empty/invalid.
         """
-        line = line.strip()
-        if not line:
+        if not line or line.isspace():
             return None
 
         try:
-            data = json.loads(line)
-        except json.JSONDecodeError as e:
+            # json.loads accepts bytes and tolerates surrounding whitespace
+            data = _json_loads(line)
+        except ValueError as e:
             logger.warning(f"[{self.session_id}] Failed to parse stream line: {e}")
             return None
 
@@ -186,8 +205,8 @@ class StreamParser:
 
     def _parse_assistant_message(self, data: Dict, timestamp: datetime) -> StreamEvent:
         """Parse assistant message event (may contain tool_use or text)."""
-        message = data.get("message", {})
-        content = message.get("content", [])
+        message = data.get("message", _EMPTY)
+        content = message.get("content", ())
 
         # Extract text and tool_use from content blocks
         text_parts = []
@@ -230,7 +249,7 @@ class StreamParser:
 
     def _parse_content_block_start(self, data: Dict, timestamp: datetime) -> StreamEvent:
         """Parse content block start (for streaming)."""
-        content_block = data.get("content_block", {})
+        content_block = data.get("content_block", _EMPTY)
         block_type = content_block.get("type")
 
         event = StreamEvent(
@@ -244,7 +263,7 @@ class StreamParser:
             event.event_type = StreamEventType.TOOL_USE
             event.tool_name = content_block.get("name")
             event.tool_use_id = content_block.get("id")
-            self._current_tool_use = {
+            self._pending_tool_uses[data.get("index", 0)] = {
                 "id": content_block.get("id"),
                 "name": content_block.get("name"),
                 "input": {}
@@ -254,7 +273,7 @@ class StreamParser:
 
     def _parse_content_block_delta(self, data: Dict, timestamp: datetime) -> StreamEvent:
         """Parse content block delta (streaming text or tool input)."""
-        delta = data.get("delta", {})
+        delta = data.get("delta", _EMPTY)
         delta_type = delta.get("type")
 
         event = StreamEvent(
@@ -265,7 +284,7 @@ class StreamParser:
 
         if delta_type == "text_delta":
             event.text = delta.get("text", "")
-        elif delta_type == "input_json_delta" and self._current_tool_use:
+        elif delta_type == "input_json_delta" and data.get("index", 0) in self._pending_tool_uses:
             # Note: Full input will be in content_block_stop or final message
             pass
 
@@ -279,11 +298,11 @@ class StreamParser:
             raw_data=data
         )
 
-        if self._current_tool_use:
+        tool_use = self._pending_tool_uses.pop(data.get("index", 0), None)
+        if tool_use:
             event.event_type = StreamEventType.TOOL_USE
-            event.tool_name = self._current_tool_use.get("name")
-            event.tool_use_id = self._current_tool_use.get("id")
-            self._current_tool_use = None
+            event.tool_name = tool_use.get("name")
+            event.tool_use_id = tool_use.get("id")
 
         return event
 
@@ -325,7 +344,7 @@ class StreamParser:
                 })
 
             # Handle multiple tool uses
-            parsed_tools = event.raw_data.get("_parsed_tool_uses", [])
+            parsed_tools = event.raw_data.get("_parsed_tool_uses", ())
             for tool in parsed_tools[1:]:  # Skip first, already added above
                 self.summary.tool_calls.append({
                     "id": tool.get("id"),
@@ -363,4 +382,4 @@ class StreamParser:
     def reset(self):
         """Reset parser state for a new execution."""
         self.summary = ExecutionSummary()
-        self._current_tool_use = None
+        self._pending_tool_uses.clear()
@@ -32,7 +32,7 @@ AgentSession 전용 메서드를 추가합니다.
 from logging import getLogger
 from typing import Dict, List, Optional
 
-from service.claude_manager.session_manager import SessionManager, is_redis_enabled, merge_mcp_configs
+from service.claude_manager.session_manager import SessionManager, gather_bounded, is_redis_enabled, merge_mcp_configs
 from service.claude_manager.models import (
     CreateSessionRequest,
     MCPConfig,
@@ -42,7 +42,6 @@ from service.claude_manager.models import (
 )
 from service.claude_manager.process_manager import ClaudeProcess
 from service.redis.redis_client import RedisClient
-from service.pod.pod_info import get_pod_info
 from service.logging.session_logger import get_session_logger, remove_session_logger
 
 from service.langgraph.agent_session import AgentSession
@@ -270,7 +269,7 @@ class AgentSessionManager(SessionManager):
             self._local_processes[session_id] = agent.process
 
         # Pod 정보
-        pod_info = get_pod_info()
+        pod_info = self.pod_info
 
         # SessionInfo 생성
         session_info = agent.get_session_info(
@@ -326,6 +325,18 @@ class AgentSessionManager(SessionManager):
         """
         return session_id in self._local_agents
 
+    def has_local_session(self, session_id: str) -> bool:
+        """
+        세션이 이 Pod에서 실행 중인지 확인 (AgentSession 포함, Redis 조회 없음).
+
+        Args:
+            session_id: 세션 ID
+
+        Returns:
+            로컬 세션 여부
+        """
+        return session_id in self._local_agents or super().has_local_session(session_id)
+
     def list_agents(self) -> List[AgentSession]:
         """
         모든 AgentSession 목록 반환.
@@ -372,9 +383,10 @@ class AgentSessionManager(SessionManager):
 
             # 세션 로거 제거
             remove_session_logger(session_id)
+            self._invalidate_session_info(session_id)
 
             # Redis에서도 삭제
-            if self.redis and self.redis.is_connected:
+            if self.redis and self.redis.accepts_writes:
                 self.redis.delete_session(session_id)
                 logger.info(f"[{session_id}] Session deleted from Redis")
 
@@ -398,10 +410,12 @@ class AgentSessionManager(SessionManager):
             if not agent.is_alive()
         ]
 
-        for session_id in dead_agents:
+        async def _cleanup_agent(session_id: str):
             logger.info(f"[{session_id}] Cleaning up dead AgentSession")
             await self.delete_session(session_id)
 
+        await gather_bounded(_cleanup_agent, dead_agents)
+
         # 기존 프로세스 정리 (AgentSession이 아닌 것만)
         dead_processes = [
             session_id
@@ -409,9 +423,13 @@ class AgentSessionManager(SessionManager):
             if session_id not in self._local_agents and not process.is_alive()
         ]
 
-        for session_id in dead_processes:
+        base_delete = super().delete_session
+
+        async def _cleanup_process(session_id: str):
             logger.info(f"[{session_id}] Cleaning up dead session")
-            await super().delete_session(session_id)
+            await base_delete(session_id)
+
+        await gather_bounded(_cleanup_process, dead_processes)
 
     # ========================================================================
     # Compatibility: Upgrade/Convert
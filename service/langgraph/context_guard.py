@@ -140,7 +140,7 @@ class ContextStatus(str, Enum):
     OVERFLOW = "overflow"  # 이미 초과
 
 
-@dataclass
+@dataclass(slots=True)
 class ContextCheckResult:
     """컨텍스트 체크 결과."""
     status: ContextStatus
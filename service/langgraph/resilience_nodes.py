@@ -267,7 +267,7 @@ def make_transcript_record_node(storage_path: str):
         if not last_output:
             return {}
 
-        stm.add_message("assistant", last_output)
+        records = [("assistant", last_output)]
 
         # Also record user input if this is the first turn
         iteration = state.get("iteration", 0)
@@ -275,9 +275,12 @@ def make_transcript_record_node(storage_path: str):
             messages = state.get("messages", [])
             for msg in messages:
                 if hasattr(msg, "type") and msg.type == "human":
-                    stm.add_message("user", msg.content)
+                    records.append(("user", msg.content))
                     break
 
+        # One timestamp and one write for the whole turn
+        stm.add_messages_bulk(records)
+
         return {}  # No state mutation
 
     return _node
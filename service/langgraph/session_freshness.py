@@ -52,7 +52,7 @@ logger = getLogger(__name__)
 # Configuration
 # ---------------------------------------------------------------------------
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class FreshnessConfig:
     """Tunable thresholds for session freshness evaluation.
 
@@ -121,7 +121,7 @@ class FreshnessStatus(str, Enum):
 # Evaluation result
 # ---------------------------------------------------------------------------
 
-@dataclass
+@dataclass(slots=True)
 class FreshnessResult:
     """Detailed result from freshness evaluation."""
 
@@ -5,17 +5,32 @@ Per-session logging system for Claude Control.
 Each session gets its own log file in the logs/ directory.
 """
 import json
+from collections import deque
 from logging import getLogger
 from datetime import datetime
 from enum import Enum
 from pathlib import Path
-from typing import Optional, Dict, Any, List
+from typing import Optional, Deque, Dict, Any, List, Tuple
 from threading import Lock
 
 from service.utils.utils import now_kst, format_kst
 
 logger = getLogger(__name__)
 
+# Last (whole second, formatted string) used for log line timestamps
+_line_ts_cache: Tuple[Optional[datetime], str] = (None, "")
+
+
+def _format_line_ts(dt: datetime) -> str:
+    """format_kst() for log lines, reused for entries within the same second."""
+    global _line_ts_cache
+    second = dt.replace(microsecond=0)
+    cached_second, text = _line_ts_cache
+    if second != cached_second:
+        text = format_kst(second)
+        _line_ts_cache = (second, text)
+    return text
+
 
 class LogLevel(str, Enum):
     """Log levels for session logging."""
@@ -36,6 +51,8 @@ class LogLevel(str, Enum):
 class LogEntry:
     """Represents a single log entry."""
 
+    __slots__ = ("level", "message", "timestamp", "metadata")
+
     def __init__(
         self,
         level: LogLevel,
@@ -59,7 +76,7 @@ class LogEntry:
 
     def to_line(self) -> str:
         """Convert log entry to formatted log line."""
-        ts = format_kst(self.timestamp)
+        ts = _format_line_ts(self.timestamp)
         meta_str = ""
         if self.metadata:
             meta_str = f" | {json.dumps(self.metadata, ensure_ascii=False)}"
@@ -107,8 +124,8 @@ class SessionLogger:
         self._lock = Lock()
 
         # In-memory log cache (for quick retrieval)
-        self._log_cache: List[LogEntry] = []
         self._max_cache_size = 1000  # Keep last 1000 entries in memory
+        self._log_cache: Deque[LogEntry] = deque(maxlen=self._max_cache_size)
 
         # Write session start entry
         self._write_header()
@@ -133,13 +150,9 @@ class SessionLogger:
             with open(self._log_file, 'a', encoding='utf-8') as f:
                 f.write(entry.to_line())
 
-            # Add to cache
+            # Add to cache (oldest entry drops off once full)
             self._log_cache.append(entry)
 
-            # Trim cache if too large
-            if len(self._log_cache) > self._max_cache_size:
-                self._log_cache = self._log_cache[-self._max_cache_size:]
-
     def log(
         self,
         level: LogLevel,
@@ -930,7 +943,7 @@ class SessionLogger:
         """
         if from_cache:
             with self._lock:
-                entries = self._log_cache[-limit:]
+                entries = list(self._log_cache)[-limit:]
                 if level:
                     entries = [e for e in entries if e.level == level]
                 return [e.to_dict() for e in entries]
@@ -22,7 +22,7 @@ import re
 import sys
 from logging import getLogger
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Callable, Dict, List, Any, Optional, Tuple
 
 from service.claude_manager.models import (
     MCPConfig,
@@ -40,6 +40,9 @@ _global_mcp_config: Optional[MCPConfig] = None
 # Project root path
 PROJECT_ROOT = Path(__file__).parent.parent
 
+# ${VAR} or ${VAR:-default} patterns
+_ENV_VAR_PATTERN = re.compile(r'\$\{([^}:]+)(?::-([^}]*))?\}')
+
 
 def get_global_mcp_config() -> Optional[MCPConfig]:
     """
@@ -62,6 +65,51 @@ def set_global_mcp_config(config: MCPConfig) -> None:
     _global_mcp_config = config
 
 
+def _replace_env_var(match: "re.Match[str]") -> str:
+    """Substitute a single ${VAR} / ${VAR:-default} match from os.environ"""
+    var_name = match.group(1)
+    default = match.group(2)
+    value = os.environ.get(var_name)
+    if value is None:
+        if default is not None:
+            return default
+        return match.group(0)  # Keep original if env var not found
+    return value
+
+
+def _build_stdio(data: Dict[str, Any]) -> MCPServerStdio:
+    """Build STDIO server config from JSON data"""
+    return MCPServerStdio(
+        command=data['command'],
+        args=data.get('args', []),
+        env=data.get('env')
+    )
+
+
+def _build_http(data: Dict[str, Any]) -> MCPServerHTTP:
+    """Build HTTP server config from JSON data"""
+    return MCPServerHTTP(
+        url=data['url'],
+        headers=data.get('headers')
+    )
+
+
+def _build_sse(data: Dict[str, Any]) -> MCPServerSSE:
+    """Build SSE server config from JSON data"""
+    return MCPServerSSE(
+        url=data['url'],
+        headers=data.get('headers')
+    )
+
+
+# server_type -> (builder, required keys)
+_SERVER_BUILDERS: Dict[str, Tuple[Callable[[Dict[str, Any]], MCPServerConfig], Tuple[str, ...]]] = {
+    'stdio': (_build_stdio, ('command',)),
+    'http': (_build_http, ('url',)),
+    'sse': (_build_sse, ('url',)),
+}
+
+
 class MCPLoader:
     """
     Auto-loader for MCP configs and tools
@@ -85,6 +133,10 @@ class MCPLoader:
         self.servers: Dict[str, MCPServerConfig] = {}
         self.tools: List[Any] = []
         self._tools_mcp_process = None
+        # Bumped whenever self.servers changes; get_config() rebuilds only on mismatch
+        self._servers_version = 0
+        self._cached_config: Optional[MCPConfig] = None
+        self._cached_config_version = -1
 
     def load_all(self) -> MCPConfig:
         """
@@ -107,7 +159,7 @@ class MCPLoader:
             self._register_tools_as_mcp()
 
         # 4. Create global config
-        config = MCPConfig(servers=self.servers)
+        config = self.get_config()
         set_global_mcp_config(config)
 
         logger.info(f"🔌 MCP Loader: Loaded {len(self.servers)} MCP servers")
@@ -143,6 +195,7 @@ class MCPLoader:
 
                 if server_config:
                     self.servers[server_name] = server_config
+                    self._servers_version += 1
                     desc = config_data.get('description', '')
                     logger.info(f"   ✅ {server_name}: {desc[:50]}..." if len(desc) > 50 else f"   ✅ {server_name}: {desc}")
 
@@ -156,20 +209,10 @@ class MCPLoader:
         Expand environment variables in config (${VAR} or ${VAR:-default} format)
         """
         if isinstance(data, str):
-            # Find ${VAR} or ${VAR:-default} patterns
-            pattern = r'\$\{([^}:]+)(?::-([^}]*))?\}'
-
-            def replace_env(match):
-                var_name = match.group(1)
-                default = match.group(2)
-                value = os.environ.get(var_name)
-                if value is None:
-                    if default is not None:
-                        return default
-                    return match.group(0)  # Keep original if env var not found
-                return value
-
-            return re.sub(pattern, replace_env, data)
+            # Most values contain no placeholder; skip the regex engine
+            if "${" not in data:
+                return data
+            return _ENV_VAR_PATTERN.sub(_replace_env_var, data)
 
         elif isinstance(data, dict):
             return {k: self._expand_env_vars(v) for k, v in data.items()}
@@ -181,37 +224,16 @@ class MCPLoader:
 
     def _create_server_config(self, data: Dict[str, Any]) -> Optional[MCPServerConfig]:
         """Create MCP server config from JSON data"""
-        server_type = data.get('type', 'stdio')
-
-        if server_type == 'stdio':
-            command = data.get('command')
-            if not command:
-                return None
-            return MCPServerStdio(
-                command=command,
-                args=data.get('args', []),
-                env=data.get('env')
-            )
-
-        elif server_type == 'http':
-            url = data.get('url')
-            if not url:
-                return None
-            return MCPServerHTTP(
-                url=url,
-                headers=data.get('headers')
-            )
+        builder, required = _SERVER_BUILDERS.get(data.get('type', 'stdio'), (None, ()))
+        if builder is None:
+            return None
 
-        elif server_type == 'sse':
-            url = data.get('url')
-            if not url:
+        # Required keys must be present and non-empty
+        for key in required:
+            if not data.get(key):
                 return None
-            return MCPServerSSE(
-                url=url,
-                headers=data.get('headers')
-            )
 
-        return None
+        return builder(data)
 
     def _load_tools(self) -> None:
         """Load tool files from tools/ folder"""
@@ -290,6 +312,7 @@ class MCPLoader:
                 args=[str(tools_server_script)],
                 env=None
             )
+            self._servers_version += 1
 
             logger.info(f"   🔧 Registered {len(self.tools)} tools as MCP server: _builtin_tools")
 
@@ -403,8 +426,16 @@ if __name__ == "__main__":
         return len(self.tools)
 
     def get_config(self) -> MCPConfig:
-        """Return current MCP config"""
-        return MCPConfig(servers=self.servers)
+        """
+        Return current MCP config
+
+        The config is cached and only rebuilt when servers changed since the
+        last call, avoiding re-validation of every server config.
+        """
+        if self._cached_config is None or self._cached_config_version != self._servers_version:
+            self._cached_config = MCPConfig(servers=self.servers)
+            self._cached_config_version = self._servers_version
+        return self._cached_config
 
 
 def merge_mcp_configs(base: Optional[MCPConfig], override: Optional[MCPConfig]) -> Optional[MCPConfig]:
@@ -0,0 +1,109 @@
+"""
+Inverted token index shared by the memory stores.
+
+Memory search counts keyword *substrings* in lowercased content, so a
+plain token lookup would miss "post" inside "postgres". Keywords never
+contain whitespace, though, which means a keyword occurs in a document
+exactly when it occurs inside one of the document's whitespace tokens.
+The index therefore keeps the de-duplicated vocabulary and matches
+keywords against it; that selects the same documents a full scan would
+while reading far less text.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_right
+from typing import Dict, FrozenSet, Hashable, Iterable, List, Optional, Set, Tuple
+
+# Shortest query word treated as a search keyword
+MIN_KEYWORD_LEN = 2
+
+
+def query_keywords(query: str) -> List[str]:
+    """Lowercase *query* and split it into search keywords."""
+    return [w for w in query.lower().split() if len(w) >= MIN_KEYWORD_LEN]
+
+
+class TokenIndex:
+    """Token -> document-key postings with exact substring candidate lookup.
+
+    Usage::
+
+        index = TokenIndex()
+        index.add("memory/MEMORY.md", "decided to use postgresql")
+        index.candidates(["postgres"])   # {"memory/MEMORY.md"}
+    """
+
+    def __init__(self) -> None:
+        self._postings: Dict[str, Set[Hashable]] = {}
+        self._doc_tokens: Dict[Hashable, FrozenSet[str]] = {}
+        # Vocabulary joined by newlines with token start offsets (lazy)
+        self._vocab: Optional[Tuple[str, List[int], List[str]]] = None
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._doc_tokens
+
+    def __len__(self) -> int:
+        return len(self._doc_tokens)
+
+    def keys(self) -> Iterable[Hashable]:
+        return self._doc_tokens.keys()
+
+    def add(self, key: Hashable, text_lower: str) -> None:
+        """Index *text_lower* (already lowercased) under *key*."""
+        if key in self._doc_tokens:
+            self.remove(key)
+
+        tokens = frozenset(text_lower.split())
+        for token in tokens:
+            self._postings.setdefault(token, set()).add(key)
+        self._doc_tokens[key] = tokens
+        self._vocab = None
+
+    def remove(self, key: Hashable) -> None:
+        """Drop a document from the index (no-op if absent)."""
+        tokens = self._doc_tokens.pop(key, None)
+        if tokens is None:
+            return
+        for token in tokens:
+            keys = self._postings.get(token)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._postings[token]
+        self._vocab = None
+
+    def clear(self) -> None:
+        self._postings.clear()
+        self._doc_tokens.clear()
+        self._vocab = None
+
+    def candidates(self, keywords: Iterable[str]) -> Set[Hashable]:
+        """Keys of documents containing any keyword as a substring.
+
+        Keywords must be lowercase and free of whitespace.
+        """
+        if self._vocab is None:
+            tokens = list(self._postings)
+            starts: list[int] = []
+            offset = 0
+            for token in tokens:
+                starts.append(offset)
+                offset += len(token) + 1
+            self._vocab = ("\n".join(tokens), starts, tokens)
+
+        text, starts, tokens = self._vocab
+        matched: set[int] = set()
+        for kw in keywords:
+            pos = text.find(kw)
+            while pos >= 0:
+                i = bisect_right(starts, pos) - 1
+                matched.add(i)
+                # Skip to the next token; one match per token is enough
+                next_start = starts[i + 1] if i + 1 < len(starts) else len(text)
+                pos = text.find(kw, next_start)
+
+        keys: set[Hashable] = set()
+        for i in matched:
+            keys |= self._postings[tokens[i]]
+        return keys
@@ -19,22 +19,42 @@ reads are done through keyword search over the markdown files.
 
 from __future__ import annotations
 
+import heapq
 import os
 import re
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone, timedelta
 from logging import getLogger
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
 
+from service.memory.index import TokenIndex, query_keywords
 from service.memory.types import MemoryEntry, MemorySearchResult, MemorySource
 
 logger = getLogger(__name__)
 
+# Multi-keyword matching in one pass (C extension) when installed
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
 KST = timezone(timedelta(hours=9))
 
 # Maximum file size we will index (256 KB).
 MAX_FILE_SIZE = 256_000
 
+# Threads used to read changed files in load_all.
+LOAD_WORKERS = 8
+
+# Distinct queries whose results are kept while no file changes.
+SEARCH_CACHE_SIZE = 32
+
+# Seconds a cached result may be reused (bounds recency-score drift).
+SEARCH_CACHE_TTL = 60.0
+
 # Only markdown files are indexed.
 _MD_PATTERN = re.compile(r"\.md$", re.IGNORECASE)
 
@@ -42,6 +62,65 @@ _MD_PATTERN = re.compile(r"\.md$", re.IGNORECASE)
 _DATE_RE = re.compile(r"(\d{4}-\d{2}-\d{2})")
 
 
+def _read_markdown(path: Path) -> str:
+    """Read a markdown file as UTF-8 text.
+
+    Reads the raw bytes in one call and decodes once, instead of going
+    through a text-mode stream's incremental decoder and newline
+    translation. CRLF endings are still normalized to LF.
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+    if b"\r" in data:
+        data = data.replace(b"\r\n", b"\n").replace(b"\r", b"\n")
+    return data.decode("utf-8")
+
+
+def _walk_md(directory: Path) -> Iterator[os.DirEntry]:
+    """Recursively yield DirEntry objects for .md files under *directory*.
+
+    DirEntry caches its stat result, so callers get size/mtime from a
+    single syscall per file.
+    """
+    try:
+        with os.scandir(directory) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    yield from _walk_md(entry.path)
+                elif entry.name.endswith(".md") and entry.is_file():
+                    yield entry
+    except OSError as exc:
+        logger.warning("LongTermMemory: cannot scan %s: %s", directory, exc)
+
+
+def _make_hit_counter(keywords: List[str]) -> Callable[[str], int]:
+    """Build a function counting keyword occurrences in lowercased text.
+
+    The count is always ``sum(text.count(kw) for kw in keywords)``, the
+    same density formula STM search uses. When pyahocorasick is installed,
+    an automaton built once per query first finds which keywords occur in
+    one scan, and only those are counted.
+    """
+    if ahocorasick is not None:
+        automaton = ahocorasick.Automaton()
+        for kw in set(keywords):
+            automaton.add_word(kw, kw)
+        automaton.make_automaton()
+        # Repeated query keywords count once per repetition
+        weights = Counter(keywords)
+
+        def count_hits(text: str) -> int:
+            found = {kw for _, kw in automaton.iter(text)}
+            return sum(text.count(kw) * weights[kw] for kw in found)
+
+        return count_hits
+
+    def count_hits(text: str) -> int:
+        return sum(text.count(kw) for kw in keywords)
+
+    return count_hits
+
+
 class LongTermMemory:
     """File-backed long-term memory inside the session storage directory.
 
@@ -70,6 +149,18 @@ class LongTermMemory:
         self._storage_path = Path(storage_path)
         self._memory_dir = self._storage_path / self.MEMORY_DIR
         self._main_file = self._memory_dir / self.MAIN_FILE
+        # Parsed files keyed by path: (mtime_ns, size, entry)
+        self._cache: Dict[Path, Tuple[int, int, MemoryEntry]] = {}
+        # Inverted index over the cached entries (keyed by filename) and
+        # the entry object each filename was indexed from
+        self._index = TokenIndex()
+        self._indexed: Dict[str, MemoryEntry] = {}
+        # Bumped whenever _sync_index sees a file change; search results
+        # are cached per (keywords, max_results) as (version, expiry, hits)
+        self._index_version = 0
+        self._search_cache: Dict[
+            Tuple[Tuple[str, ...], int], Tuple[int, float, List[MemorySearchResult]]
+        ] = {}
 
     @property
     def memory_dir(self) -> Path:
@@ -91,7 +182,7 @@ class LongTermMemory:
         """True if the memory directory has any .md files."""
         if not self._memory_dir.exists():
             return False
-        return any(self._memory_dir.rglob("*.md"))
+        return any(_walk_md(self._memory_dir))
 
     # ------------------------------------------------------------------
     # Write operations
@@ -113,8 +204,7 @@ class LongTermMemory:
         lines.append(f"<!-- {now.strftime('%Y-%m-%d %H:%M KST')} -->\n")
         lines.append(text.rstrip() + "\n")
 
-        with open(self._main_file, "a", encoding="utf-8") as f:
-            f.write("\n".join(lines))
+        self._append_text(self._main_file, "\n".join(lines))
 
         logger.debug(
             "LongTermMemory.append: wrote %d chars to %s",
@@ -139,8 +229,7 @@ class LongTermMemory:
         filepath = self._memory_dir / filename
 
         now_str = date.strftime("%H:%M KST")
-        with open(filepath, "a", encoding="utf-8") as f:
-            f.write(f"\n---\n_({now_str})_\n\n{text.rstrip()}\n")
+        self._append_text(filepath, f"\n---\n_({now_str})_\n\n{text.rstrip()}\n")
 
         logger.debug(
             "LongTermMemory.write_dated: wrote %d chars to %s",
@@ -166,15 +255,25 @@ class LongTermMemory:
         filepath = topics_dir / f"{slug}.md"
 
         now = datetime.now(KST)
-        with open(filepath, "a", encoding="utf-8") as f:
-            f.write(
-                f"\n---\n_({now.strftime('%Y-%m-%d %H:%M KST')})_\n\n"
-                f"{text.rstrip()}\n"
-            )
+        self._append_text(
+            filepath,
+            f"\n---\n_({now.strftime('%Y-%m-%d %H:%M KST')})_\n\n"
+            f"{text.rstrip()}\n",
+        )
 
         logger.debug("LongTermMemory.write_topic: %s → %s", topic, filepath)
         return filepath
 
+    def _append_text(self, filepath: Path, text: str) -> None:
+        """Append *text* to *filepath* straight away.
+
+        Writes go through immediately so other instances on the same
+        directory (e.g. the graph's memory nodes) see them on their next read.
+        """
+        with open(filepath, "a", encoding="utf-8") as f:
+            f.write(text)
+        self._cache.pop(filepath, None)
+
     # ------------------------------------------------------------------
     # Read operations
     # ------------------------------------------------------------------
@@ -184,57 +283,94 @@ class LongTermMemory:
 
         Returns entries sorted by: MEMORY.md first, then dated files
         newest-first, then alphabetical.
+
+        Files whose mtime and size are unchanged since the previous call
+        are served from the in-memory cache without being re-read.
         """
         if not self._memory_dir.exists():
+            self._cache.clear()
+            self._sync_index([])
             return []
 
         files = self._list_md_files()
-        entries: list[MemoryEntry] = []
+        # One slot per file in priority order; misses are filled in below
+        slots: list[Optional[MemoryEntry]] = []
+        misses: list[Tuple[int, Path, os.stat_result]] = []
+        cache: Dict[Path, Tuple[int, int, MemoryEntry]] = {}
 
-        for filepath in files:
-            try:
-                stat = filepath.stat()
-                if stat.st_size > MAX_FILE_SIZE or stat.st_size == 0:
-                    continue
-                content = filepath.read_text(encoding="utf-8").strip()
-                if not content:
-                    continue
-
-                rel = str(filepath.relative_to(self._storage_path))
-                mtime = datetime.fromtimestamp(stat.st_mtime, tz=KST)
-
-                entries.append(MemoryEntry(
-                    source=MemorySource.LONG_TERM,
-                    content=content,
-                    timestamp=mtime,
-                    filename=rel,
-                    metadata={"size": stat.st_size},
-                ))
-            except (OSError, UnicodeDecodeError) as exc:
-                logger.warning("LongTermMemory: skip %s: %s", filepath, exc)
+        for filepath, stat in files:
+            if stat.st_size == 0:
+                continue
 
+            cached = self._cache.get(filepath)
+            if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+                cache[filepath] = cached
+                slots.append(cached[2])
+            else:
+                misses.append((len(slots), filepath, stat))
+                slots.append(None)
+
+        if misses:
+            if len(misses) == 1:
+                loaded = [self._load_one(misses[0][1], misses[0][2])]
+            else:
+                # File reads release the GIL; overlap them
+                with ThreadPoolExecutor(max_workers=min(LOAD_WORKERS, len(misses))) as pool:
+                    loaded = list(pool.map(
+                        lambda miss: self._load_one(miss[1], miss[2]), misses
+                    ))
+
+            for (slot, filepath, stat), entry in zip(misses, loaded):
+                if entry is not None:
+                    slots[slot] = entry
+                    cache[filepath] = (stat.st_mtime_ns, stat.st_size, entry)
+
+        # Rebuilt each call so deleted files drop out of the cache
+        self._cache = cache
+        entries = [entry for entry in slots if entry is not None]
+        self._sync_index(entries)
         return entries
 
-    def load_main(self) -> Optional[MemoryEntry]:
-        """Load only the main MEMORY.md file."""
-        if not self._main_file.exists():
-            return None
+    def _load_one(self, filepath: Path, stat: os.stat_result) -> Optional[MemoryEntry]:
+        """Read one markdown file into a MemoryEntry (None if empty/unreadable)."""
         try:
-            content = self._main_file.read_text(encoding="utf-8").strip()
-            if not content:
-                return None
-            return MemoryEntry(
-                source=MemorySource.LONG_TERM,
-                content=content,
-                filename=str(self._main_file.relative_to(self._storage_path)),
-                timestamp=datetime.fromtimestamp(
-                    self._main_file.stat().st_mtime, tz=KST
-                ),
-            )
+            content = _read_markdown(filepath).strip()
         except (OSError, UnicodeDecodeError) as exc:
-            logger.warning("LongTermMemory.load_main: %s", exc)
+            logger.warning("LongTermMemory: skip %s: %s", filepath, exc)
+            return None
+        if not content:
+            return None
+
+        return MemoryEntry(
+            source=MemorySource.LONG_TERM,
+            content=content,
+            ts=datetime.fromtimestamp(stat.st_mtime, tz=KST),
+            filename=str(filepath.relative_to(self._storage_path)),
+            metadata={"size": stat.st_size},
+        )
+
+    def load_main(self) -> Optional[MemoryEntry]:
+        """Load only the main MEMORY.md file.
+
+        Shares the load_all() cache, so the entry read here is the one a
+        following search scores (and vice versa) while the file is unchanged.
+        """
+        try:
+            stat = self._main_file.stat()
+        except OSError:
+            return None
+        if stat.st_size == 0:
             return None
 
+        cached = self._cache.get(self._main_file)
+        if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+            return cached[2]
+
+        entry = self._load_one(self._main_file, stat)
+        if entry is not None:
+            self._cache[self._main_file] = (stat.st_mtime_ns, stat.st_size, entry)
+        return entry
+
     def search(
         self,
         query: str,
@@ -249,29 +385,72 @@ class LongTermMemory:
             query: Search query string.
             max_results: Maximum results to return.
         """
-        if not query.strip():
+        return self.search_tokens(query_keywords(query), max_results=max_results)
+
+    def search_tokens(
+        self,
+        keywords: List[str],
+        *,
+        max_results: int = 5,
+    ) -> List[MemorySearchResult]:
+        """Search with pre-tokenized keywords.
+
+        Lets callers searching several stores tokenize the query once.
+
+        Args:
+            keywords: Keywords from ``query_keywords``.
+        """
+        if not keywords:
             return []
 
+        # load_all() is the dirty check: it stats every file and bumps
+        # _index_version when any was added, changed or removed
         entries = self.load_all()
-        query_lower = query.lower()
-        keywords = [w for w in query_lower.split() if len(w) >= 2]
+        key = (tuple(keywords), max_results)
+        cached = self._search_cache.get(key)
+        if (
+            cached is not None
+            and cached[0] == self._index_version
+            and cached[1] > time.monotonic()
+        ):
+            return list(cached[2])
+
+        results = self._score(entries, keywords, max_results)
+
+        if len(self._search_cache) >= SEARCH_CACHE_SIZE:
+            del self._search_cache[next(iter(self._search_cache))]
+        self._search_cache[key] = (
+            self._index_version, time.monotonic() + SEARCH_CACHE_TTL, results,
+        )
+        return list(results)
 
-        if not keywords:
+    def _score(
+        self,
+        entries: List[MemoryEntry],
+        keywords: List[str],
+        max_results: int,
+    ) -> List[MemorySearchResult]:
+        """Score *entries* against *keywords* and return the top results."""
+        # Only files containing at least one keyword are scored
+        candidates = self._index.candidates(keywords)
+        if not candidates:
             return []
 
         results: list[MemorySearchResult] = []
         now = datetime.now(KST)
+        count_hits = _make_hit_counter(keywords)
+        snippet_re = re.compile(re.escape(keywords[0]), re.IGNORECASE)
 
         for entry in entries:
-            content_lower = entry.content.lower()
+            if entry.filename not in candidates:
+                continue
+
             # Keyword density score
-            hits = sum(
-                content_lower.count(kw) for kw in keywords
-            )
+            hits = count_hits(entry.content_lower)
             if hits == 0:
                 continue
 
-            density = hits / max(1, len(entry.content.split()))
+            density = hits / max(1, entry.word_count)
 
             # Recency bonus (exponential decay, half-life 30 days)
             recency = 0.0
@@ -286,7 +465,7 @@ class LongTermMemory:
             score = (density * 0.7) + (recency * 0.3)
 
             # Build snippet around first hit
-            snippet = self._extract_snippet(entry.content, keywords[0])
+            snippet = self._extract_snippet(entry.content, keywords[0], pattern=snippet_re)
 
             results.append(MemorySearchResult(
                 entry=entry,
@@ -295,24 +474,54 @@ class LongTermMemory:
                 match_type="combined",
             ))
 
-        results.sort(key=lambda r: r.score, reverse=True)
-        return results[:max_results]
+        return heapq.nlargest(max_results, results, key=lambda r: r.score)
 
     # ------------------------------------------------------------------
     # Internal helpers
     # ------------------------------------------------------------------
 
-    def _list_md_files(self) -> List[Path]:
-        """List .md files in priority order."""
+    def _sync_index(self, entries: List[MemoryEntry]) -> None:
+        """Bring the inverted index in line with the loaded entries.
+
+        Only entries that were (re)loaded since the last sync, or whose
+        file disappeared, are re-tokenized.
+        """
+        current = {entry.filename: entry for entry in entries}
+
+        changed = False
+        for filename in list(self._indexed):
+            if current.get(filename) is not self._indexed[filename]:
+                self._index.remove(filename)
+                del self._indexed[filename]
+                changed = True
+
+        for filename, entry in current.items():
+            if filename not in self._indexed:
+                self._index.add(filename, entry.content_lower)
+                self._indexed[filename] = entry
+                changed = True
+
+        if changed:
+            self._index_version += 1
+            self._search_cache.clear()
+
+    def _list_md_files(self) -> List[Tuple[Path, os.stat_result]]:
+        """List .md files with their stat results, in priority order."""
         if not self._memory_dir.exists():
             return []
 
-        all_files = [
-            f for f in self._memory_dir.rglob("*.md")
-            if f.is_file() and f.stat().st_size <= MAX_FILE_SIZE
-        ]
+        all_files: list[Tuple[Path, os.stat_result]] = []
+        for dir_entry in _walk_md(self._memory_dir):
+            try:
+                stat = dir_entry.stat()
+            except OSError as exc:
+                logger.warning("LongTermMemory: skip %s: %s", dir_entry.path, exc)
+                continue
+            if stat.st_size <= MAX_FILE_SIZE:
+                all_files.append((Path(dir_entry.path), stat))
 
-        def sort_key(p: Path) -> Tuple[int, str]:
+        def sort_key(item: Tuple[Path, os.stat_result]) -> Tuple[int, str]:
+            p = item[0]
             # MEMORY.md first (priority 0)
             if p.name == self.MAIN_FILE:
                 return (0, "")
@@ -327,13 +536,26 @@ class LongTermMemory:
         return all_files
 
     @staticmethod
-    def _extract_snippet(text: str, keyword: str, context: int = 120) -> str:
-        """Extract a snippet centered on the first keyword occurrence."""
-        idx = text.lower().find(keyword.lower())
-        if idx < 0:
+    def _extract_snippet(
+        text: str,
+        keyword: str,
+        context: int = 120,
+        pattern: Optional[re.Pattern] = None,
+    ) -> str:
+        """Extract a snippet centered on the first keyword occurrence.
+
+        *pattern* is a case-insensitive regex for *keyword*; search()
+        compiles it once per query. Matching it directly avoids building
+        a lowercased copy of the whole text.
+        """
+        if pattern is None:
+            pattern = re.compile(re.escape(keyword), re.IGNORECASE)
+        m = pattern.search(text)
+        if m is None:
             return text[:context * 2]
+        idx = m.start()
         start = max(0, idx - context)
-        end = min(len(text), idx + len(keyword) + context)
+        end = min(len(text), m.end() + context)
         snippet = text[start:end]
         if start > 0:
             snippet = "..." + snippet
@@ -18,10 +18,13 @@ It handles:
 
 from __future__ import annotations
 
+import dataclasses
+import io
 from datetime import datetime, timezone, timedelta
 from logging import getLogger
 from typing import Any, Dict, List, Optional
 
+from service.memory.index import query_keywords
 from service.memory.long_term import LongTermMemory
 from service.memory.short_term import ShortTermMemory
 from service.memory.types import (
@@ -38,6 +41,16 @@ KST = timezone(timedelta(hours=9))
 # Maximum characters injected from memory into context.
 DEFAULT_MAX_INJECT_CHARS = 8_000
 
+# Share of the injection budget reserved for each context section, in
+# priority order. Unused budget carries over to the next section; recent
+# messages get whatever is left.
+SUMMARY_BUDGET_RATIO = 0.15
+MAIN_MEMORY_BUDGET_RATIO = 0.35
+RECALL_BUDGET_RATIO = 0.35
+
+# Below this many characters a recall snippet can't fit; skip the search.
+MIN_RECALL_CHARS = 200
+
 
 class SessionMemoryManager:
     """Per-session memory facade.
@@ -165,22 +178,33 @@ class SessionMemoryManager:
             max_results: Maximum total results.
             sources: Filter to specific sources. None = all.
         """
+        keywords = self._tokenize_query(query)
+        if not keywords:
+            return []
+
         results: list[MemorySearchResult] = []
 
         if sources is None or MemorySource.LONG_TERM in sources:
-            ltm_results = self._ltm.search(query, max_results=max_results)
-            for r in ltm_results:
-                r.score *= 1.2  # Long-term memory relevance boost
-            results.extend(ltm_results)
+            ltm_results = self._ltm.search_tokens(keywords, max_results=max_results)
+            # Long-term memory relevance boost; the store's results may be
+            # cached, so boosted copies are made instead of mutating them
+            results.extend(
+                dataclasses.replace(r, score=r.score * 1.2) for r in ltm_results
+            )
 
         if sources is None or MemorySource.SHORT_TERM in sources:
-            stm_results = self._stm.search(query, max_results=max_results)
+            stm_results = self._stm.search_tokens(keywords, max_results=max_results)
             results.extend(stm_results)
 
         # Sort by combined score, deduplicate if needed
         results.sort(key=lambda r: r.score, reverse=True)
         return results[:max_results]
 
+    @staticmethod
+    def _tokenize_query(query: str) -> List[str]:
+        """Tokenize *query* once for every store searched."""
+        return query_keywords(query)
+
     # ------------------------------------------------------------------
     # Context injection
     # ------------------------------------------------------------------
@@ -208,28 +232,45 @@ class SessionMemoryManager:
             Formatted memory context string, or None if nothing to inject.
         """
         budget = max_chars or self._max_inject_chars
-        parts: list[str] = []
+        # Sections are written straight into one buffer, separated by a
+        # blank line; sections counts what has been written so far
+        buf = io.StringIO()
+        buf.write("## Recalled Memory")
+        sections = 0
         total_chars = 0
 
-        # 1. Session summary (if available)
+        # Each section may use its own share plus what earlier ones left
+        allowance = 0
+
+        # 1. Session summary (if available) — dropped if it doesn't fit
+        allowance += int(budget * SUMMARY_BUDGET_RATIO)
         if include_summary:
             summary = self._stm.get_summary()
-            if summary and (total_chars + len(summary)) <= budget:
-                parts.append(f"<session-summary>\n{summary}\n</session-summary>")
+            if summary and len(summary) <= allowance:
+                buf.write("\n\n<session-summary>\n")
+                buf.write(summary)
+                buf.write("\n</session-summary>")
+                sections += 1
                 total_chars += len(summary)
+                allowance -= len(summary)
 
-        # 2. Long-term memory: main MEMORY.md
+        # 2. Long-term memory: main MEMORY.md — truncated rather than dropped
+        allowance += int(budget * MAIN_MEMORY_BUDGET_RATIO)
         main_mem = self._ltm.load_main()
-        if main_mem and (total_chars + main_mem.char_count) <= budget:
-            parts.append(
-                f"<long-term-memory source=\"{main_mem.filename}\">\n"
-                f"{main_mem.content}\n"
-                f"</long-term-memory>"
-            )
-            total_chars += main_mem.char_count
-
-        # 3. Query-based memory retrieval
-        if query:
+        if main_mem and allowance > 0:
+            content = main_mem.content
+            if len(content) > allowance:
+                content = content[:max(0, allowance - 3)] + "..."
+            buf.write(f"\n\n<long-term-memory source=\"{main_mem.filename}\">\n")
+            buf.write(content)
+            buf.write("\n</long-term-memory>")
+            sections += 1
+            total_chars += len(content)
+            allowance -= len(content)
+
+        # 3. Query-based memory retrieval (skipped when no snippet could fit)
+        allowance += int(budget * RECALL_BUDGET_RATIO)
+        if query and allowance >= MIN_RECALL_CHARS:
             search_results = self.search(query, max_results=5)
             for result in search_results:
                 chunk = (
@@ -238,28 +279,29 @@ class SessionMemoryManager:
                     f"{result.snippet}\n"
                     f"</memory-recall>"
                 )
-                if (total_chars + len(chunk)) > budget:
+                if len(chunk) > allowance:
                     break
-                parts.append(chunk)
+                buf.write("\n\n")
+                buf.write(chunk)
+                sections += 1
                 total_chars += len(chunk)
+                allowance -= len(chunk)
 
-        # 4. Recent transcript messages
-        if include_recent > 0:
+        # 4. Recent transcript messages — lowest priority, gets the rest
+        if include_recent > 0 and total_chars < budget:
             recent = self._stm.get_recent(n=include_recent)
             for entry in recent:
                 if (total_chars + entry.char_count) > budget:
                     break
-                parts.append(
-                    f"<recent-message>\n{entry.content}\n</recent-message>"
-                )
+                buf.write("\n\n<recent-message>\n")
+                buf.write(entry.content)
+                buf.write("\n</recent-message>")
+                sections += 1
                 total_chars += entry.char_count
 
-        if not parts:
+        if not sections:
             return None
-
-        header = "## Recalled Memory\n"
-        body = "\n\n".join(parts)
-        return f"{header}\n{body}"
+        return buf.getvalue()
 
     # ------------------------------------------------------------------
     # Memory flush (pre-compaction)
@@ -325,22 +367,27 @@ class SessionMemoryManager:
     # ------------------------------------------------------------------
 
     def get_stats(self) -> MemoryStats:
-        """Compute memory statistics."""
+        """Compute memory statistics.
+
+        Short-term figures come from running totals kept by
+        ShortTermMemory; long-term entries are served from its mtime cache.
+        """
         ltm_entries = self._ltm.load_all()
-        stm_entries = self._stm.load_all()
+        stm_count, stm_chars, stm_last = self._stm.message_stats()
 
         ltm_chars = sum(e.char_count for e in ltm_entries)
-        stm_chars = sum(e.char_count for e in stm_entries)
 
         all_timestamps = [
-            e.timestamp for e in ltm_entries + stm_entries
+            e.timestamp for e in ltm_entries
             if e.timestamp is not None
         ]
+        if stm_last is not None:
+            all_timestamps.append(stm_last)
         last_write = max(all_timestamps) if all_timestamps else None
 
         return MemoryStats(
             long_term_entries=len(ltm_entries),
-            short_term_entries=len(stm_entries),
+            short_term_entries=stm_count,
             long_term_chars=ltm_chars,
             short_term_chars=stm_chars,
             total_files=len(ltm_entries),
@@ -22,21 +22,64 @@ session (and maybe a bit longer for post-mortem analysis).
 
 from __future__ import annotations
 
+import heapq
 import json
+import time
 from datetime import datetime, timezone, timedelta
 from logging import getLogger
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
+from service.memory.index import TokenIndex, query_keywords
 from service.memory.types import MemoryEntry, MemorySearchResult, MemorySource
 
 logger = getLogger(__name__)
 
 KST = timezone(timedelta(hours=9))
+# UTC offset as isoformat() renders it for KST
+_KST_SUFFIX = "+09:00"
+
+# Use orjson (C extension) for transcript lines when installed
+try:
+    import orjson
+
+    _json_loads = orjson.loads
+
+    def _dump_line(record: Dict[str, Any]) -> bytes:
+        return orjson.dumps(
+            record,
+            default=str,
+            option=orjson.OPT_APPEND_NEWLINE | orjson.OPT_NON_STR_KEYS,
+        )
+except ImportError:
+    _json_loads = json.loads
+
+    def _dump_line(record: Dict[str, Any]) -> bytes:
+        line = json.dumps(record, ensure_ascii=False, default=str) + "\n"
+        return line.encode("utf-8")
 
 # Maximum transcript size before we start dropping old entries from search.
 MAX_TRANSCRIPT_ENTRIES = 2000
 
+# Distinct queries whose results are kept until the transcript grows
+SEARCH_CACHE_SIZE = 64
+
+
+def _parse_ts(value: Any) -> Optional[datetime]:
+    """Parse a record's "ts"; naive times are taken as KST so all compare."""
+    if not isinstance(value, str):
+        return None
+    try:
+        dt = datetime.fromisoformat(value)
+    except ValueError:
+        return None
+    return dt.replace(tzinfo=KST) if dt.tzinfo is None else dt
+
+
+def _message_text(record: Dict[str, Any]) -> str:
+    """Display text of a message record ("[role] content")."""
+    return f"[{record.get('role', 'unknown')}] {record.get('content', '')}"
+
 
 class ShortTermMemory:
     """JSONL-backed short-term transcript memory.
@@ -70,6 +113,32 @@ class ShortTermMemory:
         self._main_file = self._transcript_dir / self.MAIN_FILE
         self._summary_file = self._transcript_dir / self.SUMMARY_FILE
 
+        # Second and formatted "YYYY-MM-DDTHH:MM:SS" last used by _now_iso()
+        self._iso_sec = -1
+        self._iso_prefix = ""
+        # Parsed transcript records and the byte offset parsed up to.
+        # Reads only parse what was appended since (by any writer).
+        self._records: List[Dict[str, Any]] = []
+        self._read_offset = 0
+        self._lines_read = 0
+        # Message records indexed by record position (see search()).
+        # Search scans columns parallel to _records (None/-1 for events and
+        # not-yet-counted words) and only builds MemoryEntry objects, kept
+        # in _entries, for the messages it returns.
+        self._index = TokenIndex()
+        self._texts_lower: List[Optional[str]] = []
+        self._word_counts: List[int] = []
+        self._entries: Dict[int, MemoryEntry] = {}
+        # Running totals over message entries (see message_stats())
+        self._message_count = 0
+        self._message_chars = 0
+        # Latest message time, and the raw "ts" it was last compared from
+        self._last_ts: Optional[datetime] = None
+        self._last_ts_raw = ""
+        # Search results by (keywords, max_results, snippets), valid for _read_offset
+        self._search_cache: Dict[Tuple[Tuple[str, ...], int, bool], List[MemorySearchResult]] = {}
+        self._search_cache_offset = 0
+
     @property
     def transcript_file(self) -> Path:
         return self._main_file
@@ -96,6 +165,7 @@ class ShortTermMemory:
         content: str,
         *,
         metadata: Optional[Dict[str, Any]] = None,
+        ts: Optional[datetime] = None,
     ) -> None:
         """Append a message to the transcript.
 
@@ -103,39 +173,68 @@ class ShortTermMemory:
             role: "user", "assistant", or "system".
             content: Message text.
             metadata: Optional extra fields (tool_calls, duration_ms, etc.).
+            ts: Message time (default: now).
         """
         self.ensure_directory()
-        now = datetime.now(KST)
-
         record: Dict[str, Any] = {
             "type": "message",
             "role": role,
             "content": content,
-            "ts": now.isoformat(),
+            "ts": ts.isoformat() if ts else self._now_iso(),
         }
         if metadata:
             record["metadata"] = metadata
 
         self._append_jsonl(record)
 
+    def add_messages_bulk(
+        self,
+        messages: List[Tuple[str, str]],
+        *,
+        ts: Optional[datetime] = None,
+    ) -> None:
+        """Append several (role, content) messages with one timestamp.
+
+        The clock is read once and all lines go out in a single write.
+
+        Args:
+            messages: (role, content) pairs in transcript order.
+            ts: Time recorded for every message (default: now).
+        """
+        if not messages:
+            return
+        self.ensure_directory()
+        ts_iso = ts.isoformat() if ts else self._now_iso()
+
+        self._write_lines(b"".join(
+            _dump_line({
+                "type": "message",
+                "role": role,
+                "content": content,
+                "ts": ts_iso,
+            })
+            for role, content in messages
+        ))
+
     def add_event(
         self,
         event: str,
         data: Optional[Dict[str, Any]] = None,
+        *,
+        ts: Optional[datetime] = None,
     ) -> None:
         """Append an event (tool call, state change, etc.) to the transcript.
 
         Args:
             event: Event type string (e.g., "tool_call", "state_change").
             data: Event payload.
+            ts: Event time (default: now).
         """
         self.ensure_directory()
-        now = datetime.now(KST)
-
         record: Dict[str, Any] = {
             "type": "event",
             "event": event,
-            "ts": now.isoformat(),
+            "ts": ts.isoformat() if ts else self._now_iso(),
         }
         if data:
             record["data"] = data
@@ -162,43 +261,34 @@ class ShortTermMemory:
     def load_all(self) -> List[MemoryEntry]:
         """Load all transcript entries as MemoryEntry objects."""
         records = self._read_jsonl()
-        entries: list[MemoryEntry] = []
-
-        for i, record in enumerate(records):
-            if record.get("type") != "message":
-                continue
-
-            role = record.get("role", "unknown")
-            content = record.get("content", "")
-            ts_str = record.get("ts")
-
-            timestamp = None
-            if ts_str:
-                try:
-                    timestamp = datetime.fromisoformat(ts_str)
-                except (ValueError, TypeError):
-                    pass
-
-            entries.append(MemoryEntry(
-                source=MemorySource.SHORT_TERM,
-                content=f"[{role}] {content}",
-                timestamp=timestamp,
-                filename=str(self._main_file.relative_to(self._storage_path)),
-                line_start=i + 1,
-                line_end=i + 1,
-                metadata={"role": role, **(record.get("metadata") or {})},
-            ))
-
-        return entries
+        return [
+            self._record_to_entry(i, record)
+            for i, record in enumerate(records)
+            if record.get("type") == "message"
+        ]
 
     def get_recent(self, n: int = 20) -> List[MemoryEntry]:
         """Load the N most recent messages.
 
+        Walks the records backwards and builds entries only for the
+        messages returned, instead of converting the whole transcript.
+
         Args:
             n: Number of messages to return.
         """
-        all_entries = self.load_all()
-        return all_entries[-n:] if len(all_entries) > n else all_entries
+        if n <= 0:
+            return []
+
+        records = self._read_jsonl()
+        recent: list[MemoryEntry] = []
+        for i in range(len(records) - 1, -1, -1):
+            if records[i].get("type") == "message":
+                recent.append(self._record_to_entry(i, records[i]))
+                if len(recent) == n:
+                    break
+
+        recent.reverse()
+        return recent
 
     def get_summary(self) -> Optional[str]:
         """Load the session summary if it exists."""
@@ -214,42 +304,80 @@ class ShortTermMemory:
         query: str,
         *,
         max_results: int = 10,
+        snippets: bool = True,
     ) -> List[MemorySearchResult]:
         """Keyword search over transcript messages.
 
         Args:
             query: Search string.
             max_results: Maximum results to return.
+            snippets: Build result snippets; pass False when only the
+                entries are needed.
         """
-        if not query.strip():
-            return []
+        return self.search_tokens(
+            query_keywords(query), max_results=max_results, snippets=snippets,
+        )
+
+    def search_tokens(
+        self,
+        keywords: List[str],
+        *,
+        max_results: int = 10,
+        snippets: bool = True,
+    ) -> List[MemorySearchResult]:
+        """Search with pre-tokenized keywords.
 
-        entries = self.load_all()
-        query_lower = query.lower()
-        keywords = [w for w in query_lower.split() if len(w) >= 2]
+        Lets callers searching several stores tokenize the query once.
 
+        Args:
+            keywords: Keywords from ``query_keywords``.
+        """
         if not keywords:
             return []
 
-        results: list[MemorySearchResult] = []
-
-        for entry in entries:
-            content_lower = entry.content.lower()
-            hits = sum(content_lower.count(kw) for kw in keywords)
+        records = self._read_jsonl()
+        if self._search_cache_offset != self._read_offset:
+            self._search_cache.clear()
+            self._search_cache_offset = self._read_offset
+
+        key = (tuple(keywords), max_results, snippets)
+        cached = self._search_cache.get(key)
+        if cached is not None:
+            return list(cached)
+
+        # Recency is line position over message count; constant per call
+        inv_count = 1.0 / max(1, self._message_count)
+        texts_lower = self._texts_lower
+        word_counts = self._word_counts
+        scored: list[Tuple[float, int]] = []
+
+        # Only messages containing a keyword are scored
+        for index in sorted(self._index.candidates(keywords)):
+            text_lower = texts_lower[index]
+            hits = sum(text_lower.count(kw) for kw in keywords)
             if hits == 0:
                 continue
 
-            score = hits / max(1, len(entry.content.split()))
+            words = word_counts[index]
+            if words < 0:
+                words = word_counts[index] = len(text_lower.split())
+            score = hits / max(1, words)
 
             # Recency boost: more recent entries score higher
-            if entry.line_start is not None:
-                recency = entry.line_start / max(1, len(entries))
-                score = score * 0.6 + recency * 0.4
+            recency = (index + 1) * inv_count
+            score = score * 0.6 + recency * 0.4
 
-            snippet = entry.content[:240]
-            if len(entry.content) > 240:
-                snippet += "..."
+            scored.append((score, index))
 
+        # Entries and snippets are built only for the results that make the cut
+        results: list[MemorySearchResult] = []
+        for score, index in heapq.nlargest(max_results, scored, key=lambda s: s[0]):
+            entry = self._record_to_entry(index, records[index])
+            snippet = ""
+            if snippets:
+                snippet = entry.content[:240]
+                if len(entry.content) > 240:
+                    snippet += "..."
             results.append(MemorySearchResult(
                 entry=entry,
                 score=score,
@@ -257,45 +385,172 @@ class ShortTermMemory:
                 match_type="keyword",
             ))
 
-        results.sort(key=lambda r: r.score, reverse=True)
-        return results[:max_results]
+        if len(self._search_cache) >= SEARCH_CACHE_SIZE:
+            del self._search_cache[next(iter(self._search_cache))]
+        self._search_cache[key] = results
+        return list(results)
+
+    def message_stats(self) -> Tuple[int, int, Optional[datetime]]:
+        """Return (message count, total message chars, latest timestamp).
+
+        Maintained as records are parsed, so this costs a stat call plus
+        parsing whatever was appended since the last read.
+        """
+        self._read_jsonl()
+        return self._message_count, self._message_chars, self._last_ts
 
     def message_count(self) -> int:
-        """Count total messages in the transcript."""
-        records = self._read_jsonl()
-        return sum(1 for r in records if r.get("type") == "message")
+        """Count total messages in the transcript.
+
+        Served from the running counter; only newly appended lines are parsed.
+        """
+        self._read_jsonl()
+        return self._message_count
 
     # ------------------------------------------------------------------
     # Internal helpers
     # ------------------------------------------------------------------
 
+    def _record_to_entry(self, index: int, record: Dict[str, Any]) -> MemoryEntry:
+        """Convert the message record at *index* into a MemoryEntry (memoized)."""
+        entry = self._entries.get(index)
+        if entry is not None:
+            return entry
+
+        role = record.get("role", "unknown")
+        ts_str = record.get("ts")
+
+        entry = MemoryEntry(
+            source=MemorySource.SHORT_TERM,
+            content=_message_text(record),
+            # Parsed only if something reads entry.timestamp
+            ts=ts_str if isinstance(ts_str, str) and ts_str else None,
+            filename=str(self._main_file.relative_to(self._storage_path)),
+            line_start=index + 1,
+            line_end=index + 1,
+            metadata={"role": role, **(record.get("metadata") or {})},
+        )
+        self._entries[index] = entry
+        return entry
+
+    def _now_iso(self) -> str:
+        """Current KST time in isoformat(), reusing the formatted second.
+
+        Only the microseconds change between writes within one second, so
+        the date/time prefix is formatted once per second.
+        """
+        now = time.time()
+        sec = int(now)
+        if sec != self._iso_sec:
+            self._iso_sec = sec
+            self._iso_prefix = datetime.fromtimestamp(sec, KST).strftime(
+                "%Y-%m-%dT%H:%M:%S"
+            )
+        return f"{self._iso_prefix}.{int((now - sec) * 1_000_000):06d}{_KST_SUFFIX}"
+
     def _append_jsonl(self, record: Dict[str, Any]) -> None:
         """Append a JSON record to the transcript file."""
+        self._write_lines(_dump_line(record))
+
+    def _write_lines(self, data: bytes) -> None:
+        """Append encoded JSONL lines to the transcript file."""
         try:
-            with open(self._main_file, "a", encoding="utf-8") as f:
-                f.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+            # One open/write per batch; no handle outlives the call
+            with open(self._main_file, "ab") as f:
+                f.write(data)
         except OSError as exc:
             logger.warning("ShortTermMemory: write failed: %s", exc)
 
     def _read_jsonl(self) -> List[Dict[str, Any]]:
-        """Read all records from the transcript file."""
-        if not self._main_file.exists():
-            return []
+        """Return all records from the transcript file.
+
+        Records parsed by earlier calls are kept; only bytes appended
+        since then are read and parsed. The returned list is shared and
+        must not be modified by callers.
+        """
+        try:
+            size = self._main_file.stat().st_size
+        except OSError:
+            self._reset_records()
+            return self._records
+
+        if size < self._read_offset:
+            # Truncated or replaced: start over
+            self._reset_records()
+        if size == self._read_offset:
+            return self._records
 
-        records: list[Dict[str, Any]] = []
         try:
-            with open(self._main_file, "r", encoding="utf-8") as f:
-                for line_no, line in enumerate(f, 1):
-                    line = line.strip()
-                    if not line:
-                        continue
-                    try:
-                        records.append(json.loads(line))
-                    except json.JSONDecodeError:
-                        logger.debug(
-                            "ShortTermMemory: bad JSON at line %d", line_no
-                        )
+            with open(self._main_file, "rb") as f:
+                f.seek(self._read_offset)
+                data = f.read(size - self._read_offset)
         except OSError as exc:
             logger.warning("ShortTermMemory: read failed: %s", exc)
+            return self._records
+
+        # Keep a trailing partial line for the next read unless it is
+        # already a complete record (file not newline-terminated)
+        end = data.rfind(b"\n") + 1
+        tail = data[end:]
+        if tail.strip():
+            try:
+                _json_loads(tail)
+                end = len(data)
+            except ValueError:
+                pass
+
+        lines = data[:end].split(b"\n")
+        if lines and not lines[-1]:
+            lines.pop()  # empty piece after the final newline
+
+        first_line = self._lines_read + 1
+        self._lines_read += len(lines)
+
+        # Parsers accept the surrounding whitespace, so lines are only
+        # checked for blankness (isspace() does not copy like strip())
+        for line_no, line in enumerate(lines, first_line):
+            if not line or line.isspace():
+                continue
+            try:
+                record = _json_loads(line)
+            except ValueError:
+                logger.debug("ShortTermMemory: bad JSON at line %d", line_no)
+                continue
 
-        return records
+            self._records.append(record)
+            if record.get("type") == "message":
+                text = _message_text(record)
+                text_lower = text.lower()
+                self._index.add(len(self._records) - 1, text_lower)
+                self._texts_lower.append(text_lower)
+                self._message_count += 1
+                self._message_chars += len(text)
+                # Compared as datetimes: caller-supplied ts may be naive or
+                # use another offset. Batches share one string, parsed once.
+                ts_str = record.get("ts")
+                if ts_str != self._last_ts_raw:
+                    self._last_ts_raw = ts_str
+                    ts = _parse_ts(ts_str)
+                    if ts is not None and (self._last_ts is None or ts > self._last_ts):
+                        self._last_ts = ts
+            else:
+                self._texts_lower.append(None)
+            self._word_counts.append(-1)
+
+        self._read_offset += end
+        return self._records
+
+    def _reset_records(self) -> None:
+        """Forget parsed records so the transcript is re-read from the start."""
+        self._records = []
+        self._read_offset = 0
+        self._lines_read = 0
+        self._index.clear()
+        self._texts_lower = []
+        self._word_counts = []
+        self._entries = {}
+        self._message_count = 0
+        self._message_chars = 0
+        self._last_ts = None
+        self._last_ts_raw = ""
+        self._search_cache.clear()
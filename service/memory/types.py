@@ -7,7 +7,7 @@ from __future__ import annotations
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Union
 
 
 class MemorySource(str, Enum):
@@ -17,7 +17,7 @@ class MemorySource(str, Enum):
     BOOTSTRAP = "bootstrap"       # Project context files (AGENTS.md, etc.)
 
 
-@dataclass
+@dataclass(slots=True)
 class MemoryEntry:
     """A single piece of stored memory.
 
@@ -26,11 +26,41 @@ class MemoryEntry:
     """
     source: MemorySource
     content: str
-    timestamp: Optional[datetime] = None
+    # datetime, or a raw ISO-8601 string parsed on first .timestamp access
+    ts: Union[datetime, str, None] = None
     filename: Optional[str] = None
     line_start: Optional[int] = None
     line_end: Optional[int] = None
-    metadata: Dict[str, Any] = field(default_factory=dict)
+    # None when the entry carries no extra fields (no per-entry empty dict)
+    metadata: Optional[Dict[str, Any]] = None
+    _content_lower: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+    _word_count: Optional[int] = field(default=None, init=False, repr=False, compare=False)
+
+    @property
+    def content_lower(self) -> str:
+        """Lowercased content, computed once and reused by every search."""
+        if self._content_lower is None:
+            self._content_lower = self.content.lower()
+        return self._content_lower
+
+    @property
+    def word_count(self) -> int:
+        """Whitespace-separated word count, computed once (search scoring)."""
+        if self._word_count is None:
+            self._word_count = len(self.content.split())
+        return self._word_count
+
+    @property
+    def timestamp(self) -> Optional[datetime]:
+        """Entry time; a raw ISO string is parsed (and cached) here."""
+        ts = self.ts
+        if isinstance(ts, str):
+            try:
+                ts = datetime.fromisoformat(ts)
+            except ValueError:
+                ts = None
+            self.ts = ts
+        return ts
 
     @property
     def char_count(self) -> int:
@@ -42,7 +72,7 @@ class MemoryEntry:
         return max(1, len(self.content) // 3)
 
 
-@dataclass
+@dataclass(slots=True)
 class MemorySearchResult:
     """A search hit with relevance score."""
     entry: MemoryEntry
@@ -59,7 +89,7 @@ class MemorySearchResult:
         return self.entry.content
 
 
-@dataclass
+@dataclass(slots=True)
 class MemoryStats:
     """Aggregate statistics about the memory store."""
     long_term_entries: int = 0
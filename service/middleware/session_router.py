@@ -4,33 +4,37 @@ Session Routing Middleware
 Session-based request routing in multi-pod environments
 Proxies to the appropriate Pod if session is on a different Pod
 """
+import asyncio
 import os
-import re
-from logging import getLogger
-from typing import Optional, Callable
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.types import ASGIApp
+import threading
+import time
+from functools import lru_cache
+from logging import DEBUG, getLogger
+from typing import Callable, Dict, Optional, Tuple
+from fastapi import Request
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Receive, Scope, Send
 
 from service.redis.redis_client import RedisClient
 from service.pod.pod_info import get_pod_info, PodInfo
-from service.proxy.internal_proxy import get_internal_proxy, PROXY_HEADER
+from service.proxy.internal_proxy import get_internal_proxy, PROXY_HEADER, PROXY_SOURCE_HEADER
 
 logger = getLogger(__name__)
 
 
+# Read once, on first call rather than at import: main.py imports this
+# module before load_dotenv() has populated USE_REDIS
+@lru_cache(maxsize=1)
 def is_redis_enabled() -> bool:
     """Check if Redis is enabled via environment variable."""
     return os.getenv('USE_REDIS', 'false').lower() == 'true'
 
 
-# URL patterns to extract session ID from
-SESSION_URL_PATTERNS = [
-    # /api/sessions/{session_id} (legacy)
-    re.compile(r'^/api/sessions/([a-f0-9-]{36})(?:/.*)?$'),
-    # /api/agents/{session_id} (new)
-    re.compile(r'^/api/agents/([a-f0-9-]{36})(?:/.*)?$'),
-]
+# URLs to extract session ID from (see _extract_session_id):
+# /api/sessions/{session_id} (legacy) and /api/agents/{session_id} (new),
+# where session_id is 36 characters of [a-f0-9-]
+_SESSION_COLLECTIONS = frozenset(('sessions', 'agents'))
+_SESSION_ID_CHARS = frozenset('0123456789abcdef-')
 
 # Routes that require session routing
 SESSION_ROUTES = [
@@ -47,23 +51,86 @@ EXCLUDED_ROUTES = [
     '/',
 ]
 
+# How long (seconds) a session's (pod_name, pod_ip) is served from memory.
+# Entries are dropped sooner when the session's change is published on the
+# Redis events channel, or when the old pod answers 404/410 or cannot be
+# reached; the TTL covers events missed while the listener is down.
+POD_INFO_CACHE_TTL = 30.0
+
+# Maximum sessions kept in the pod-info cache
+POD_INFO_CACHE_SIZE = 10_000
+
+# Proxy statuses meaning the cached pod no longer serves the session
+_STALE_POD_STATUSES = frozenset((404, 410, 502))
+
+# Per-request lookups: exact excludes as a set, route prefixes as one
+# str.startswith call (tuple argument, checked in C)
+_EXCLUDED = frozenset(EXCLUDED_ROUTES)
+_SESSION_ROUTE_PREFIXES = tuple(SESSION_ROUTES)
+
+
+# ASGI header names arrive lowercased as bytes
+_PROXY_HEADER_KEY = PROXY_HEADER.lower().encode("latin-1")
+_PROXY_HEADER_TRUE = b"true"
+
+
+def _is_proxied(scope: Scope) -> bool:
+    """Check the proxy-loop header on the raw ASGI header list."""
+    for key, value in scope["headers"]:
+        if key == _PROXY_HEADER_KEY:
+            # First occurrence wins, as with Headers.get()
+            return value == _PROXY_HEADER_TRUE
+    return False
 
-class SessionRoutingMiddleware(BaseHTTPMiddleware):
+
+class SessionRoutingMiddleware:
     """
     Session-based request routing middleware
 
-    Proxies to the Pod containing the session if not on current Pod
+    Proxies to the Pod containing the session if not on current Pod.
+    Implemented as plain ASGI: pass-through requests go straight to the
+    app without BaseHTTPMiddleware's task group and response streaming.
     """
 
-    def __init__(self, app: ASGIApp, redis_client: Optional[RedisClient] = None):
-        super().__init__(app)
-        self._redis: Optional[RedisClient] = redis_client
+    def __init__(
+        self,
+        app: ASGIApp,
+        redis_client: Optional[RedisClient] = None,
+        is_local_session: Optional[Callable[[str], bool]] = None,
+    ):
+        self.app = app
+        self._redis: Optional[RedisClient] = None
+        # In-memory check for sessions owned by this pod; a hit skips Redis
+        self._is_local_session = is_local_session
         # Cache whether Redis is enabled at startup
         self._redis_enabled: bool = is_redis_enabled()
+        # Pod identity, resolved on first use (after startup has run init_pod_info)
+        self._pod_info: Optional[PodInfo] = None
+        # session_id -> (expires_at, (pod_name, pod_ip)); see POD_INFO_CACHE_TTL.
+        # Also dropped by the Redis session-event thread, hence the lock
+        self._pod_cache: Dict[str, Tuple[float, Tuple[str, str]]] = {}
+        self._pod_cache_lock = threading.Lock()
+        if redis_client is not None:
+            self.set_redis_client(redis_client)
 
     def set_redis_client(self, redis_client: RedisClient):
         """Set Redis client (lazy injection)"""
         self._redis = redis_client
+        # Sessions saved/deleted by any pod are published on the events
+        # channel; drop their cached location right away
+        redis_client.add_session_event_listener(self._on_session_event)
+
+    def _on_session_event(self, session_id: str):
+        """Forget a changed session's pod (called from the Redis listener thread)."""
+        with self._pod_cache_lock:
+            self._pod_cache.pop(session_id, None)
+
+    @property
+    def pod_info(self) -> PodInfo:
+        """Return this pod's identity (fixed for the process lifetime)."""
+        if self._pod_info is None:
+            self._pod_info = get_pod_info()
+        return self._pod_info
 
     @property
     def redis(self) -> Optional[RedisClient]:
@@ -75,125 +142,129 @@ class SessionRoutingMiddleware(BaseHTTPMiddleware):
         if self._redis is None:
             from service.redis.redis_client import get_redis_client
             try:
-                self._redis = get_redis_client()
+                redis_client = get_redis_client()
             except Exception:
-                pass
+                redis_client = None
+            if redis_client is not None:
+                self.set_redis_client(redis_client)
         return self._redis
 
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """
         Process request
 
         1. If Redis disabled, skip routing entirely (local mode)
-        2. If already proxied, process directly
-        3. Check if route needs session routing
+        2. Check if route needs session routing
+        3. If already proxied, process directly
         4. Proxy if session is on different Pod
         5. Process locally if on current Pod
         """
-        # If Redis is disabled, skip all session routing (local mode)
-        if not self._redis_enabled:
-            return await call_next(request)
-
-        path = request.url.path
-        method = request.method
+        # Non-HTTP traffic (websocket, lifespan) and local mode pass through
+        if scope["type"] != "http" or not self._redis_enabled:
+            await self.app(scope, receive, send)
+            return
 
-        logger.debug(f"🔍 [SessionRouter] Incoming request: {method} {path}")
+        path = scope["path"]
 
-        # If already proxied, process directly
-        if request.headers.get(PROXY_HEADER) == "true":
-            source_pod = request.headers.get("X-Claude-Control-Source-Pod", "unknown")
-            logger.debug(f"📥 Handling proxied request from {source_pod}: {path}")
-            return await call_next(request)
+        # Excluded routes and routes without session routing run locally.
+        # Checked first: most requests end here without touching headers.
+        if path in _EXCLUDED or not path.startswith(_SESSION_ROUTE_PREFIXES):
+            await self.app(scope, receive, send)
+            return
 
-        # Check excluded routes
-        if self._is_excluded_route(path):
-            return await call_next(request)
+        logger.debug("🔍 [SessionRouter] Incoming request: %s %s", scope["method"], path)
 
-        # Check if route needs session routing
-        if not self._needs_session_routing(path):
-            return await call_next(request)
+        # If already proxied, process directly
+        if _is_proxied(scope):
+            if logger.isEnabledFor(DEBUG):
+                source_pod = Headers(scope=scope).get(PROXY_SOURCE_HEADER, "unknown")
+                logger.debug("📥 Handling proxied request from %s: %s", source_pod, path)
+            await self.app(scope, receive, send)
+            return
 
         # Extract session ID
-        session_id = await self._extract_session_id(request)
+        session_id = self._extract_session_id(path)
 
-        logger.info(f"🔍 [SessionRouter] Session ID extracted: {session_id}")
+        logger.debug("🔍 [SessionRouter] Session ID extracted: %s", session_id)
 
         if not session_id:
             # No session ID, process locally
-            logger.debug(f"🔍 [SessionRouter] No session_id, processing locally")
-            return await call_next(request)
+            logger.debug("🔍 [SessionRouter] No session_id, processing locally")
+            await self.app(scope, receive, send)
+            return
+
+        # Sessions running here need no lookup (the common case behind
+        # ingress affinity)
+        if self._is_local_session is not None and self._is_local_session(session_id):
+            await self.app(scope, receive, send)
+            return
 
         # Check session's Pod info from Redis
-        routing_result = self._get_session_pod_info(session_id)
+        routing_result = await self._get_session_pod_info(session_id)
 
-        logger.debug(f"🔍 [SessionRouter] Routing result: {routing_result}")
+        logger.debug("🔍 [SessionRouter] Routing result: %s", routing_result)
 
         if routing_result is None:
             # No session info, process locally (session may be local-only)
-            logger.debug(f"Session {session_id} not in Redis, processing locally")
-            return await call_next(request)
+            logger.debug("Session %s not in Redis, processing locally", session_id)
+            await self.app(scope, receive, send)
+            return
 
         target_pod_name, target_pod_ip = routing_result
 
         # Check if same as current Pod
-        pod_info = get_pod_info()
+        pod_info = self.pod_info
 
-        logger.debug(f"🔍 [SessionRouter] Target: {target_pod_name}@{target_pod_ip}, Current: {pod_info.pod_name}@{pod_info.pod_ip}")
+        logger.debug(
+            "🔍 [SessionRouter] Target: %s@%s, Current: %s@%s",
+            target_pod_name, target_pod_ip, pod_info.pod_name, pod_info.pod_ip,
+        )
 
         if target_pod_name == pod_info.pod_name or target_pod_ip == pod_info.pod_ip:
             # Process on current Pod
-            logger.info(f"📍 Session {session_id[:8]}... is on this pod, processing locally")
-            return await call_next(request)
+            logger.debug("📍 Session %.8s... is on this pod, processing locally", session_id)
+            await self.app(scope, receive, send)
+            return
 
         # Proxy to different Pod
-        logger.info(f"🔀 Session {session_id[:8]}... is on {target_pod_name} ({target_pod_ip}), proxying...")
+        logger.info(
+            "🔀 Session %.8s... is on %s (%s), proxying...",
+            session_id, target_pod_name, target_pod_ip,
+        )
 
+        # Only proxied requests need a Request (body, query, headers)
         proxy = get_internal_proxy()
-        return await proxy.proxy_request(
+        response = await proxy.proxy_request(
             target_pod_ip=target_pod_ip,
             target_port=pod_info.service_port,
-            request=request,
+            request=Request(scope, receive),
             source_pod_name=pod_info.pod_name
         )
+        if response.status_code in _STALE_POD_STATUSES:
+            with self._pod_cache_lock:
+                self._pod_cache.pop(session_id, None)
+        await response(scope, receive, send)
 
-    def _is_excluded_route(self, path: str) -> bool:
-        """Check if route should be excluded"""
-        # Exact match
-        if path in EXCLUDED_ROUTES:
-            return True
-
-        # Session list view (exactly /api/sessions)
-        if path == '/api/sessions':
-            return True
-
-        return False
-
-    def _needs_session_routing(self, path: str) -> bool:
-        """Check if route needs session routing"""
-        for route in SESSION_ROUTES:
-            if path.startswith(route):
-                return True
-        return False
-
-    async def _extract_session_id(self, request: Request) -> Optional[str]:
+    def _extract_session_id(self, path: str) -> Optional[str]:
         """
         Extract session ID from request
 
         Extracts session ID from URL path
         """
-        path = request.url.path
-
-        # Extract from URL pattern
-        for pattern in SESSION_URL_PATTERNS:
-            match = pattern.match(path)
-            if match:
-                return match.group(1)
-
-        return None
+        # Split as '', 'api', collection, session_id[, rest]
+        parts = path.split('/', 4)
+        if len(parts) < 4 or parts[0] or parts[1] != 'api':
+            return None
+        if parts[2] not in _SESSION_COLLECTIONS:
+            return None
+        session_id = parts[3]
+        if len(session_id) != 36 or not _SESSION_ID_CHARS.issuperset(session_id):
+            return None
+        return session_id
 
-    def _get_session_pod_info(self, session_id: str) -> Optional[tuple]:
+    async def _get_session_pod_info(self, session_id: str) -> Optional[tuple]:
         """
-        Get session's Pod info from Redis
+        Get session's Pod info from Redis (cached for POD_INFO_CACHE_TTL)
 
         Returns:
             (pod_name, pod_ip) or None
@@ -202,26 +273,44 @@ class SessionRoutingMiddleware(BaseHTTPMiddleware):
         if not self._redis_enabled:
             return None
 
+        cached = self._pod_cache.get(session_id)
+        if cached:
+            if cached[0] > time.monotonic():
+                return cached[1]
+            with self._pod_cache_lock:
+                self._pod_cache.pop(session_id, None)
+
         if not self.redis or not self.redis.is_connected:
             # Only log warning when Redis was supposed to be available
             logger.warning("Redis enabled but not connected - session routing unavailable")
             return None
 
         try:
-            session_data = self.redis.get_session(session_id)
-
-            if not session_data:
+            # Only the two routing fields, not the whole session document.
+            # The client is synchronous; run the round trip off the event
+            # loop so other requests proceed meanwhile.
+            fields = await asyncio.to_thread(
+                self.redis.get_session_fields, session_id, 'pod_name', 'pod_ip'
+            )
+
+            if not fields:
                 return None
 
-            pod_name = session_data.get('pod_name')
-            pod_ip = session_data.get('pod_ip')
+            pod_name, pod_ip = fields
 
             if not pod_name or not pod_ip:
-                logger.warning(f"Session {session_id} has no pod info")
+                logger.warning("Session %s has no pod info", session_id)
                 return None
 
+            with self._pod_cache_lock:
+                if len(self._pod_cache) >= POD_INFO_CACHE_SIZE:
+                    # Oldest insertion first (dicts keep insertion order)
+                    del self._pod_cache[next(iter(self._pod_cache))]
+                self._pod_cache[session_id] = (
+                    time.monotonic() + POD_INFO_CACHE_TTL, (pod_name, pod_ip)
+                )
             return (pod_name, pod_ip)
 
         except Exception as e:
-            logger.error(f"Failed to get session pod info: {e}")
+            logger.error("Failed to get session pod info: %s", e)
             return None
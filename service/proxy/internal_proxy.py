@@ -13,6 +13,12 @@ logger = getLogger(__name__)
 # Proxy request timeout (seconds)
 PROXY_TIMEOUT = 60.0
 
+# Connection pool shared by all proxied requests (per process)
+PROXY_MAX_CONNECTIONS = 200
+PROXY_MAX_KEEPALIVE_CONNECTIONS = 100
+# Seconds an idle pooled connection to another Pod is kept open
+PROXY_KEEPALIVE_EXPIRY = 30.0
+
 # Proxy header (prevent infinite loop)
 PROXY_HEADER = "X-Claude-Control-Proxied"
 PROXY_SOURCE_HEADER = "X-Claude-Control-Source-Pod"
@@ -45,8 +51,15 @@ class InternalProxy:
     async def _get_client(self) -> httpx.AsyncClient:
         """Get HTTP client (lazy initialization)"""
         if self._client is None or self._client.is_closed:
+            # One pooled client for the process: repeat hops to the same
+            # Pod reuse keep-alive connections instead of reconnecting
             self._client = httpx.AsyncClient(
                 timeout=httpx.Timeout(self._timeout),
+                limits=httpx.Limits(
+                    max_connections=PROXY_MAX_CONNECTIONS,
+                    max_keepalive_connections=PROXY_MAX_KEEPALIVE_CONNECTIONS,
+                    keepalive_expiry=PROXY_KEEPALIVE_EXPIRY,
+                ),
                 follow_redirects=True
             )
         return self._client
@@ -6,8 +6,9 @@ In multi-pod environments, Redis acts as the source of truth
 """
 import os
 import json
+import time
 from logging import getLogger
-from typing import Dict, Any, Optional, List
+from typing import Callable, Dict, Any, Optional, List, Tuple
 from datetime import datetime
 
 logger = getLogger(__name__)
@@ -16,6 +17,27 @@ logger = getLogger(__name__)
 import redis
 REDIS_AVAILABLE = True
 
+# Use orjson (C extension) for session documents when installed
+try:
+    import orjson
+    _json_dumps = orjson.dumps
+    _json_loads = orjson.loads
+except ImportError:
+    _json_dumps = json.dumps
+    _json_loads = json.loads
+
+# Number of session documents fetched per MGET in get_all_sessions
+SESSION_FETCH_BATCH = 500
+
+# Consecutive connection/timeout errors before Redis calls are skipped
+CIRCUIT_FAILURE_THRESHOLD = 3
+# Seconds Redis calls are skipped once the circuit opens
+CIRCUIT_OPEN_SECONDS = 10.0
+
+# Optimistic-lock retries for a field update racing other writers
+FIELD_UPDATE_RETRIES = 5
+
+
 class RedisClient:
     """
     Redis client for Claude session management
@@ -59,12 +81,29 @@ class RedisClient:
         self._socket_timeout = float(os.getenv('REDIS_SOCKET_TIMEOUT', '5'))
         self._socket_connect_timeout = float(os.getenv('REDIS_CONNECT_TIMEOUT', '3'))
 
+        # Connection pool settings
+        self._max_connections = int(os.getenv('REDIS_MAX_CONNECTIONS', '64'))
+        self._health_check_interval = int(os.getenv('REDIS_HEALTH_CHECK_INTERVAL', '30'))
+
         # Key prefix (multi-tenant support)
         self._key_prefix = key_prefix
 
         # Connection state
         self._connection_available = False
         self._redis_client: Optional['redis.Redis'] = None
+        self._pool: Optional['redis.ConnectionPool'] = None
+
+        # Session event listener (see subscribe_session_events)
+        self._event_thread = None
+        self._on_events_stopped: Optional[Callable[[], None]] = None
+        # (on_event, on_stopped, on_started) kept so _connect can resubscribe
+        self._event_subscriber: Optional[Tuple[Callable, ...]] = None
+        # Extra per-event callbacks (see add_session_event_listener)
+        self._event_listeners: List[Callable[[str], None]] = []
+
+        # Circuit breaker state (see _record_failure)
+        self._consecutive_failures = 0
+        self._circuit_open_until = 0.0
 
         # Attempt Redis connection
         self._connect()
@@ -74,20 +113,34 @@ class RedisClient:
     def _connect(self) -> bool:
         """Connect to Redis server"""
         try:
-            self._redis_client = redis.Redis(
+            # Release sockets from a previous connection attempt
+            self.close()
+
+            # Bounded shared pool: concurrent requests each check out a
+            # connection instead of opening one per call
+            self._pool = redis.ConnectionPool(
                 host=self._host,
                 port=self._port,
                 db=self._db,
                 password=self._password,
                 decode_responses=True,
                 socket_timeout=self._socket_timeout,
-                socket_connect_timeout=self._socket_connect_timeout
+                socket_connect_timeout=self._socket_connect_timeout,
+                max_connections=self._max_connections,
+                health_check_interval=self._health_check_interval
             )
+            self._redis_client = redis.Redis(connection_pool=self._pool)
 
             # Test connection
             self._redis_client.ping()
             self._connection_available = True
+            self._consecutive_failures = 0
+            self._circuit_open_until = 0.0
             logger.info(f"✅ Redis connected: {self._host}:{self._port}")
+
+            # close() stopped the listener; resume it on the new connection
+            if self._event_subscriber is not None:
+                self.subscribe_session_events(*self._event_subscriber)
             return True
 
         except redis.exceptions.ConnectionError as e:
@@ -125,9 +178,42 @@ class RedisClient:
 
     @property
     def is_connected(self) -> bool:
-        """Check Redis connection status"""
+        """Check Redis connection status (False while the circuit is open)"""
+        return self._connection_available and time.monotonic() >= self._circuit_open_until
+
+    @property
+    def accepts_writes(self) -> bool:
+        """
+        Check whether session writes should be attempted
+
+        Unlike is_connected this ignores the circuit breaker: a skipped
+        write is never retried, so a session saved while the circuit is
+        open would stay invisible to other pods.
+        """
         return self._connection_available
 
+    def _record_success(self):
+        """Reset the circuit breaker after a successful call"""
+        self._consecutive_failures = 0
+
+    def _record_failure(self, error: Exception):
+        """
+        Count connection/timeout errors and open the circuit when they pile up
+
+        While open, is_connected reports False so callers fall back to
+        local process state instead of stalling on socket timeouts.
+        """
+        if not isinstance(error, (redis.exceptions.ConnectionError, redis.exceptions.TimeoutError)):
+            return
+
+        self._consecutive_failures += 1
+        if self._consecutive_failures >= CIRCUIT_FAILURE_THRESHOLD:
+            self._circuit_open_until = time.monotonic() + CIRCUIT_OPEN_SECONDS
+            logger.warning(
+                f"⚠️  Redis unavailable ({self._consecutive_failures} consecutive failures) - "
+                f"using local state for {CIRCUIT_OPEN_SECONDS:.0f}s"
+            )
+
     def health_check(self) -> bool:
         """Check Redis connection health"""
         if not self._connection_available or not self._redis_client:
@@ -144,12 +230,30 @@ class RedisClient:
         logger.info("Attempting Redis reconnection...")
         return self._connect()
 
+    def close(self):
+        """Stop the session event listener and disconnect all pooled connections"""
+        self._stop_event_listener()
+
+        pool = getattr(self, '_pool', None)
+        if pool is not None:
+            try:
+                pool.disconnect()
+            except Exception as e:
+                logger.warning(f"Redis pool close failed: {e}")
+            self._pool = None
+        self._connection_available = False
+
     # ========== Key Management ==========
 
     def _make_key(self, *parts: str) -> str:
         """Generate key (with prefix)"""
         return f"{self._key_prefix}:{':'.join(parts)}"
 
+    @property
+    def _events_channel(self) -> str:
+        """Pub/Sub channel carrying the IDs of created/updated/deleted sessions"""
+        return self._make_key("sessions", "events")
+
     # ========== Session Management ==========
 
     def save_session(self, session_id: str, session_data: Dict[str, Any], ttl: Optional[int] = None) -> bool:
@@ -164,7 +268,7 @@ class RedisClient:
         Returns:
             Success status
         """
-        if not self._connection_available:
+        if not self.accepts_writes:
             # Silent skip - caller should check is_connected before calling
             return False
 
@@ -174,19 +278,25 @@ class RedisClient:
             # Convert datetime objects to ISO format strings
             data_to_save = self._serialize_session_data(session_data)
 
+            # Document write and session list update share one round trip
+            pipe = self._redis_client.pipeline(transaction=False)
             if ttl:
-                self._redis_client.setex(key, ttl, json.dumps(data_to_save))
+                pipe.setex(key, ttl, _json_dumps(data_to_save))
             else:
-                self._redis_client.set(key, json.dumps(data_to_save))
+                pipe.set(key, _json_dumps(data_to_save))
 
             # Also add to session list
             sessions_set_key = self._make_key("sessions")
-            self._redis_client.sadd(sessions_set_key, session_id)
+            pipe.sadd(sessions_set_key, session_id)
+            pipe.publish(self._events_channel, session_id)
+            pipe.execute()
+            self._record_success()
 
             logger.debug(f"Session saved: {session_id}")
             return True
 
         except Exception as e:
+            self._record_failure(e)
             logger.error(f"Session save failed: {session_id} - {e}")
             return False
 
@@ -200,22 +310,59 @@ class RedisClient:
         Returns:
             Session data or None
         """
-        if not self._connection_available:
+        if not self.is_connected:
             return None
 
         try:
             key = self._make_key("session", session_id)
             data = self._redis_client.get(key)
+            self._record_success()
 
             if data:
-                session_data = json.loads(data)
+                session_data = _json_loads(data)
                 return self._deserialize_session_data(session_data)
             return None
 
         except Exception as e:
+            self._record_failure(e)
             logger.error(f"Session retrieval failed: {session_id} - {e}")
             return None
 
+    def get_session_fields(self, session_id: str, *fields: str) -> Optional[List[Optional[str]]]:
+        """
+        Retrieve selected string fields of a session
+
+        Reads the document with a plain GET and picks the fields out on
+        this side, keeping the parse work off the shared Redis server
+        (used for request routing).
+
+        Args:
+            session_id: Session ID
+            *fields: Field names
+
+        Returns:
+            Field values in order (None for missing/non-string fields),
+            or None if the session does not exist
+        """
+        if not self.is_connected:
+            return None
+
+        try:
+            key = self._make_key("session", session_id)
+            raw = self._redis_client.get(key)
+            self._record_success()
+            if raw is None:
+                return None
+
+            doc = _json_loads(raw)
+            values = [doc.get(name) for name in fields]
+            return [v if isinstance(v, str) else None for v in values]
+
+        except Exception as e:
+            self._record_failure(e)
+            logger.error(f"Session field retrieval failed: {session_id} - {e}")
+            return None
+
     def delete_session(self, session_id: str) -> bool:
         """
         Delete session
@@ -226,21 +373,27 @@ class RedisClient:
         Returns:
             Success status
         """
-        if not self._connection_available:
+        if not self.accepts_writes:
             return False
 
         try:
             key = self._make_key("session", session_id)
-            self._redis_client.delete(key)
-
-            # Also remove from session list
             sessions_set_key = self._make_key("sessions")
-            self._redis_client.srem(sessions_set_key, session_id)
+
+            # MULTI/EXEC: the document, its session list entry and the
+            # change notification go together or not at all
+            pipe = self._redis_client.pipeline(transaction=True)
+            pipe.delete(key)
+            pipe.srem(sessions_set_key, session_id)
+            pipe.publish(self._events_channel, session_id)
+            pipe.execute()
+            self._record_success()
 
             logger.debug(f"Session deleted: {session_id}")
             return True
 
         except Exception as e:
+            self._record_failure(e)
             logger.error(f"Session deletion failed: {session_id} - {e}")
             return False
 
@@ -251,7 +404,7 @@ class RedisClient:
         Returns:
             List of session IDs
         """
-        if not self._connection_available:
+        if not self.is_connected:
             return []
 
         try:
@@ -259,6 +412,7 @@ class RedisClient:
             return list(self._redis_client.smembers(sessions_set_key))
 
         except Exception as e:
+            self._record_failure(e)
             logger.error(f"Session list retrieval failed: {e}")
             return []
 
@@ -269,24 +423,59 @@ class RedisClient:
         Returns:
             List of session data
         """
-        if not self._connection_available:
+        if not self.is_connected:
             return []
 
         try:
             session_ids = self.list_sessions()
             sessions = []
 
-            for session_id in session_ids:
-                session_data = self.get_session(session_id)
-                if session_data:
-                    sessions.append(session_data)
+            # Fetch documents in MGET batches instead of one GET per session
+            for start in range(0, len(session_ids), SESSION_FETCH_BATCH):
+                batch = session_ids[start:start + SESSION_FETCH_BATCH]
+                keys = [self._make_key("session", session_id) for session_id in batch]
 
+                for data in self._redis_client.mget(keys):
+                    if data:
+                        sessions.append(self._deserialize_session_data(_json_loads(data)))
+
+            self._record_success()
             return sessions
 
         except Exception as e:
+            self._record_failure(e)
             logger.error(f"All sessions retrieval failed: {e}")
             return []
 
+    def get_sessions(self, session_ids: List[str]) -> Optional[Dict[str, Optional[Dict[str, Any]]]]:
+        """
+        Retrieve several sessions with a single MGET
+
+        Args:
+            session_ids: Session IDs
+
+        Returns:
+            Mapping of session ID -> session data (None if missing),
+            or None if the lookup failed
+        """
+        if not self.is_connected:
+            return None
+
+        try:
+            keys = [self._make_key("session", session_id) for session_id in session_ids]
+            values = self._redis_client.mget(keys) if keys else []
+            self._record_success()
+
+            return {
+                session_id: self._deserialize_session_data(_json_loads(data)) if data else None
+                for session_id, data in zip(session_ids, values)
+            }
+
+        except Exception as e:
+            self._record_failure(e)
+            logger.error(f"Session batch retrieval failed: {e}")
+            return None
+
     def session_exists(self, session_id: str) -> bool:
         """
         Check if session exists
@@ -297,7 +486,7 @@ class RedisClient:
         Returns:
             Existence status
         """
-        if not self._connection_available:
+        if not self.is_connected:
             return False
 
         try:
@@ -305,6 +494,7 @@ class RedisClient:
             return self._redis_client.exists(key) > 0
 
         except Exception as e:
+            self._record_failure(e)
             logger.error(f"Session existence check failed: {session_id} - {e}")
             return False
 
@@ -320,22 +510,158 @@ class RedisClient:
         Returns:
             Success status
         """
-        if not self._connection_available:
+        updated = self.update_sessions_field([session_id], field, value)
+        if updated is None:
+            return False
+        if not updated:
+            logger.warning(f"Session not found for update: {session_id}")
             return False
+        return True
+
+    def update_sessions_field(
+        self,
+        session_ids: List[str],
+        field: str,
+        value: Any
+    ) -> Optional[List[str]]:
+        """
+        Set one field on several sessions without rewriting other fields
+
+        The documents are read and rewritten inside a WATCH/MULTI
+        transaction, retried if another writer touches them in between,
+        so concurrent updates from other pods are never overwritten. Key
+        TTLs are kept and the JSON encoding matches save_session.
+
+        Args:
+            session_ids: Session IDs
+            field: Field name
+            value: New value
+
+        Returns:
+            IDs of the sessions that were updated (missing ones are
+            skipped), or None on failure
+        """
+        if not self.accepts_writes:
+            return None
+        if not session_ids:
+            return []
+
+        new_value = self._serialize_session_data({field: value})[field]
+        keys = [self._make_key("session", session_id) for session_id in session_ids]
 
         try:
-            session_data = self.get_session(session_id)
-            if not session_data:
-                logger.warning(f"Session not found for update: {session_id}")
-                return False
+            with self._redis_client.pipeline() as pipe:
+                for _ in range(FIELD_UPDATE_RETRIES):
+                    try:
+                        pipe.watch(*keys)
+                        raws = pipe.mget(keys)
+
+                        pipe.multi()
+                        updated = []
+                        for session_id, key, raw in zip(session_ids, keys, raws):
+                            if raw is None:
+                                continue
+                            doc = _json_loads(raw)
+                            doc[field] = new_value
+                            pipe.set(key, _json_dumps(doc), keepttl=True)
+                            updated.append(session_id)
+                        for session_id in updated:
+                            pipe.publish(self._events_channel, session_id)
+                        pipe.execute()
+
+                        self._record_success()
+                        return updated
+                    except redis.exceptions.WatchError:
+                        continue
+
+            logger.warning(f"Session field update kept conflicting: {field} ({len(session_ids)} sessions)")
+            return None
 
-            session_data[field] = value
-            return self.save_session(session_id, session_data)
+        except Exception as e:
+            self._record_failure(e)
+            logger.error(f"Session field update failed: {field} ({len(session_ids)} sessions) - {e}")
+            return None
+
+    # ========== Session Events ==========
+
+    def subscribe_session_events(
+        self,
+        on_event: Callable[[str], None],
+        on_stopped: Callable[[], None],
+        on_started: Optional[Callable[[], None]] = None
+    ) -> bool:
+        """
+        Listen for session changes published by any pod
+
+        save_session / update_session_field / delete_session publish the
+        session ID on the events channel; on_event is called with that ID
+        from a background thread. on_stopped is called if the listener
+        dies or is closed, after which no further events are delivered
+        until the next successful reconnect() resubscribes; on_started is
+        called each time the listener (re)starts.
+
+        Returns:
+            Whether the listener was started
+        """
+        if not self.is_connected or self._event_thread is not None:
+            return False
+
+        def _handle(message: Dict[str, Any]):
+            session_id = message["data"]
+            on_event(session_id)
+            for listener in self._event_listeners:
+                try:
+                    listener(session_id)
+                except Exception as e:
+                    logger.warning(f"Session event listener failed: {e}")
+
+        def _on_error(error: Exception, pubsub, thread):
+            logger.warning(f"Session event listener stopped: {error}")
+            self._stop_event_listener()
+
+        try:
+            pubsub = self._redis_client.pubsub(ignore_subscribe_messages=True)
+            pubsub.subscribe(**{self._events_channel: _handle})
+            self._event_thread = pubsub.run_in_thread(
+                sleep_time=1.0, daemon=True, exception_handler=_on_error
+            )
+            self._on_events_stopped = on_stopped
+            self._event_subscriber = (on_event, on_stopped, on_started)
+            logger.info(f"Subscribed to session events: {self._events_channel}")
+            if on_started is not None:
+                on_started()
+            return True
 
         except Exception as e:
-            logger.error(f"Session field update failed: {session_id}.{field} - {e}")
+            self._record_failure(e)
+            logger.error(f"Session event subscription failed: {e}")
             return False
 
+    def add_session_event_listener(self, on_event: Callable[[str], None]):
+        """
+        Also deliver session change events to on_event
+
+        Called from the listener thread started by subscribe_session_events,
+        while it runs; registering before it starts is fine.
+        """
+        if on_event not in self._event_listeners:
+            self._event_listeners.append(on_event)
+
+    def _stop_event_listener(self):
+        """Stop the session event thread and notify the subscriber"""
+        thread = getattr(self, '_event_thread', None)
+        on_stopped = getattr(self, '_on_events_stopped', None)
+        self._event_thread = None
+        self._on_events_stopped = None
+
+        if thread is not None:
+            try:
+                thread.stop()
+            except Exception as e:
+                logger.warning(f"Session event listener stop failed: {e}")
+        if on_stopped is not None:
+            on_stopped()
+
     # ========== Utilities ==========
 
     def _serialize_session_data(self, data: Dict[str, Any]) -> Dict[str, Any]:
@@ -374,7 +700,7 @@ class RedisClient:
         Returns:
             Success status
         """
-        if not self._connection_available:
+        if not self.is_connected:
             return False
 
         try:
@@ -386,6 +712,7 @@ class RedisClient:
             return True
 
         except Exception as e:
+            self._record_failure(e)
             logger.error(f"All sessions deletion failed: {e}")
             return False
 
@@ -403,7 +730,7 @@ class RedisClient:
         Returns:
             Success status
         """
-        if not self._connection_available:
+        if not self.is_connected:
             return False
 
         try:
@@ -418,6 +745,7 @@ class RedisClient:
             return True
 
         except Exception as e:
+            self._record_failure(e)
             logger.error(f"Redis set failed: {key} - {e}")
             return False
 
@@ -432,7 +760,7 @@ class RedisClient:
         Returns:
             Value or default value
         """
-        if not self._connection_available:
+        if not self.is_connected:
             return default
 
         try:
@@ -443,11 +771,12 @@ class RedisClient:
                 return default
 
             try:
-                return json.loads(data)
+                return _json_loads(data)
             except json.JSONDecodeError:
                 return data
 
         except Exception as e:
+            self._record_failure(e)
             logger.error(f"Redis get failed: {key} - {e}")
             return default
 
@@ -461,7 +790,7 @@ class RedisClient:
         Returns:
             Success status
         """
-        if not self._connection_available:
+        if not self.is_connected:
             return False
 
         try:
@@ -470,6 +799,7 @@ class RedisClient:
             return True
 
         except Exception as e:
+            self._record_failure(e)
             logger.error(f"Redis delete failed: {key} - {e}")
             return False
 
@@ -483,7 +813,7 @@ class RedisClient:
         Returns:
             Existence status
         """
-        if not self._connection_available:
+        if not self.is_connected:
             return False
 
         try:
@@ -491,6 +821,7 @@ class RedisClient:
             return self._redis_client.exists(full_key) > 0
 
         except Exception as e:
+            self._record_failure(e)
             logger.error(f"Redis exists failed: {key} - {e}")
             return False
 
@@ -508,6 +839,7 @@ class RedisClient:
             "host": self._host,
             "port": self._port,
             "db": self._db,
+            "max_connections": self._max_connections,
             "key_prefix": self._key_prefix,
             "session_count": 0,
             "redis_info": None